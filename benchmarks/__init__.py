@@ -0,0 +1,5 @@
+from .fake_llm_server import FakeLLMServer
+
+__all__ = [
+    "FakeLLMServer",
+]
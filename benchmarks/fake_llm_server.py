@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from config import evaluation_config
+from utils.logger import logger
+
+CRITERIA_PATTERN = re.compile("|".join(evaluation_config.CRITERIA))
+LIST_SIZE_PATTERN = re.compile(r"JSON (?:array|list) of (\d+)", re.IGNORECASE)
+
+
+class FakeLLMServer:
+    """
+    Local stand-in for the OpenAI chat-completions and Anthropic messages APIs.
+
+    Requests posted to a path ending in ``/messages`` are answered in the
+    Anthropic format, all others in the OpenAI format. Scores depend only on
+    the request, so every run scores the same argument the same way, while
+    generated text differs on every request, as sampled completions do:
+
+    - evaluation prompts get a score derived from a hash of the prompt,
+    - multi-criteria prompts get a JSON object with one score per criterion,
+    - prompts asking for a JSON array/list of N items get N distinct arguments,
+    - anything else gets a generated argument.
+
+    Latency is drawn from ``latency_distribution`` ("constant", "uniform",
+    "normal" or "lognormal") around ``latency_ms`` with spread
+    ``latency_jitter_ms``. A share of requests fail with a 500
+    (``error_rate``) or a 429 (``rate_limit_rate``), and ``requests_per_minute``
+    enforces a sliding-window quota answered with 429 and Retry-After.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8089,
+        latency_ms: float = 200.0,
+        latency_jitter_ms: float = 50.0,
+        latency_distribution: str = "lognormal",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        requests_per_minute: int | None = None,
+        seed: int | None = None,
+    ):
+        if latency_distribution not in ("constant", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.random = random.Random(seed)
+        self.request_times: deque = deque()
+        self.stats: Counter = Counter()
+        # Sequence number mixed into generated text so every request differs
+        self.samples = 0
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def openai_endpoint(self) -> str:
+        return f"{self.base_url}/v1/chat/completions"
+
+    @property
+    def anthropic_endpoint(self) -> str:
+        return f"{self.base_url}/v1/messages"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/{path:.*}", self._handle)
+        app.router.add_get("/stats", self._handle_stats)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 binds an ephemeral port; report the one actually used
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Fake LLM server listening on {self.base_url}")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("Fake LLM server stopped")
+
+    def _latency(self) -> float:
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        if self.latency_distribution == "constant":
+            latency = mean
+        elif self.latency_distribution == "uniform":
+            latency = self.random.uniform(mean - jitter, mean + jitter)
+        elif self.latency_distribution == "normal":
+            latency = self.random.gauss(mean, jitter)
+        else:
+            # Lognormal with the given mean and standard deviation, giving the
+            # long tail real provider latencies show
+            sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2)) if mean > 0 else 0.0
+            latency = self.random.lognormvariate(math.log(mean or 1) - sigma**2 / 2, sigma)
+        return max(0.0, latency) / 1000
+
+    def _quota_retry_after(self) -> float | None:
+        """
+        Records a request against the per-minute quota, or returns how many
+        seconds the client must wait if the quota is used up.
+        """
+        if self.requests_per_minute is None:
+            return None
+        now = time.monotonic()
+        while self.request_times and now - self.request_times[0] >= 60:
+            self.request_times.popleft()
+        if len(self.request_times) >= self.requests_per_minute:
+            return 60 - (now - self.request_times[0])
+        self.request_times.append(now)
+        return None
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        anthropic = request.path.rstrip("/").endswith("/messages")
+        provider = "anthropic" if anthropic else "openai"
+        self.stats["requests"] += 1
+        self.stats[f"{provider}_requests"] += 1
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            self.stats["status_400"] += 1
+            return self._error(anthropic, 400, "invalid_request_error", "Invalid JSON")
+
+        retry_after = self._quota_retry_after()
+        if retry_after is None and self.random.random() < self.rate_limit_rate:
+            retry_after = 1.0
+        if retry_after is not None:
+            self.stats["status_429"] += 1
+            return self._error(
+                anthropic,
+                429,
+                "rate_limit_error",
+                "Rate limit exceeded",
+                {"Retry-After": f"{retry_after:.2f}"},
+            )
+
+        await asyncio.sleep(self._latency())
+        if self.random.random() < self.error_rate:
+            self.stats["status_500"] += 1
+            return self._error(anthropic, 500, "api_error", "Internal server error")
+
+        system, prompt = self._split_messages(data, anthropic)
+        count = 1 if anthropic else int(data.get("n", 1))
+        self.samples += 1
+        replies = [
+            self._reply(data.get("model", ""), system, prompt, self.samples * 1000 + i)
+            for i in range(count)
+        ]
+        self.stats["status_200"] += 1
+
+        prompt_tokens = (len(system) + len(prompt)) // 4
+        completion_tokens = sum(len(reply) for reply in replies) // 4
+        if anthropic:
+            return web.json_response(
+                {
+                    "id": f"msg_{self._hash(system, prompt)[:24]}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": data.get("model"),
+                    "content": [{"type": "text", "text": replies[0]}],
+                    "stop_reason": "end_turn",
+                    "usage": {
+                        "input_tokens": prompt_tokens,
+                        "output_tokens": completion_tokens,
+                    },
+                }
+            )
+        return web.json_response(
+            {
+                "id": f"chatcmpl-{self._hash(system, prompt)[:24]}",
+                "object": "chat.completion",
+                "model": data.get("model"),
+                "choices": [
+                    {
+                        "index": i,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop",
+                    }
+                    for i, reply in enumerate(replies)
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+    @staticmethod
+    def _split_messages(data: Dict[str, Any], anthropic: bool) -> tuple:
+        messages: List[Dict[str, Any]] = data.get("messages", [])
+        system = (data.get("system") or "") if anthropic else ""
+        user = []
+        for message in messages:
+            if message.get("role") == "system":
+                system += str(message.get("content", ""))
+            else:
+                user.append(str(message.get("content", "")))
+        return system, "\n".join(user)
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def _score(self, *parts: str) -> float:
+        return int(self._hash(*parts)[:8], 16) % 101 / 100
+
+    def _reply(self, model: str, system: str, prompt: str, sample: int) -> str:
+        list_size = LIST_SIZE_PATTERN.search(system + prompt)
+        if list_size:
+            return json.dumps(
+                [
+                    self._argument(model, system, prompt, sample * 1000 + i)
+                    for i in range(int(list_size.group(1)))
+                ]
+            )
+        if "JSON object" in system:
+            criteria = dict.fromkeys(CRITERIA_PATTERN.findall(prompt))
+            return json.dumps(
+                {
+                    criterion: self._score(model, system, prompt, criterion)
+                    for criterion in criteria
+                }
+            )
+        if "evaluat" in system.lower():
+            return str(self._score(model, system, prompt))
+        return self._argument(model, system, prompt, sample)
+
+    def _argument(self, model: str, system: str, prompt: str, sample: int) -> str:
+        digest = self._hash(model, system, prompt, str(sample))
+        return (
+            f"Argument {digest[:8]}: evidence {digest[8:14]} shows the claim holds "
+            f"because outcome {digest[14:20]} follows from premise {digest[20:26]}."
+        )
+
+    @staticmethod
+    def _error(
+        anthropic: bool,
+        status: int,
+        error_type: str,
+        message: str,
+        headers: Dict[str, str] | None = None,
+    ) -> web.Response:
+        if anthropic:
+            body = {"type": "error", "error": {"type": error_type, "message": message}}
+        else:
+            body = {"error": {"type": error_type, "message": message, "code": status}}
+        return web.json_response(body, status=status, headers=headers)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["constant", "uniform", "normal", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--requests-per-minute", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def server_from_args(args: argparse.Namespace) -> FakeLLMServer:
+    return FakeLLMServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        requests_per_minute=args.requests_per_minute,
+        seed=args.seed,
+    )
+
+
+async def serve(server: FakeLLMServer) -> None:
+    await server.start()
+    print(f"CHATGPT_API_ENDPOINT={server.openai_endpoint}")
+    print(f"CLAUDE_API_ENDPOINT={server.anthropic_endpoint}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(server_from_args(build_arg_parser().parse_args())))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from benchmarks.fake_llm_server import (
+    FakeLLMServer,
+    build_arg_parser as build_server_arg_parser,
+    server_from_args,
+)
+from config import api_config, evaluation_config
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+async def run_load_test(
+    server: FakeLLMServer,
+    num_arguments: int = 100,
+    max_concurrency: int = evaluation_config.MAX_CONCURRENT_ARGUMENTS,
+    rate_limits: bool = True,
+) -> Dict[str, Any]:
+    """
+    Evaluates ``num_arguments`` synthetic arguments end to end through the real
+    models and API clients, with both providers pointed at ``server``.
+    Caching is disabled so every score is a request to the server.
+    """
+    await server.start()
+    os.environ["CHATGPT_API_ENDPOINT"] = server.openai_endpoint
+    os.environ["CLAUDE_API_ENDPOINT"] = server.anthropic_endpoint
+    os.environ.setdefault("CHATGPT_API_KEY", "fake-key")
+    os.environ.setdefault("CLAUDE_API_KEY", "fake-key")
+    # Must be set before the clients are created, which read them on init
+    api_config.RESPONSE_CACHE_ENABLED = False
+    if not rate_limits:
+        api_config.RATE_LIMITS = {}
+
+    from evaluation.model_factory import ModelFactory
+    from evaluation.models.model_injector import ModelInjector
+    from services.evaluation_service import EvaluationService
+
+    model_factory = ModelFactory()
+    ModelInjector.inject_models(model_factory)
+    evaluation_service = EvaluationService(model_factory)
+    arguments = [
+        f"Load test argument {i}: the proposal improves outcomes for group {i % 7}."
+        for i in range(num_arguments)
+    ]
+
+    await model_factory.start_clients()
+    failed = 0
+    started_at = time.monotonic()
+    try:
+        async for _, evaluation in evaluation_service.evaluate_many_as_completed(
+            arguments, use_cache=False, max_concurrency=max_concurrency
+        ):
+            if evaluation is None:
+                failed += len(model_factory.get_models())
+            else:
+                failed += sum(scores is None for scores in evaluation.values())
+    finally:
+        elapsed = time.monotonic() - started_at
+        await model_factory.close_clients()
+        await server.stop()
+
+    return {
+        "arguments": num_arguments,
+        "max_concurrency": max_concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "arguments_per_second": round(num_arguments / elapsed, 2),
+        "requests_per_second": round(server.stats["requests"] / elapsed, 2),
+        "unavailable_model_scores": failed,
+        "request_latency_seconds": {
+            name: {
+                operation: {
+                    "p50": window.percentile(50),
+                    "p95": window.percentile(95),
+                }
+                for operation, window in model.api_client.latencies.items()
+            }
+            for name, model in model_factory.get_models().items()
+        },
+        "server": dict(server.stats),
+        "evaluation": evaluation_service.get_cache_stats(),
+        "model_health": model_factory.get_model_health(),
+        "metrics": metrics.snapshot(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure evaluation throughput against the fake LLM server",
+        parents=[build_server_arg_parser()],
+        conflict_handler="resolve",
+    )
+    parser.add_argument("--arguments", type=int, default=100)
+    parser.add_argument(
+        "--concurrency", type=int, default=evaluation_config.MAX_CONCURRENT_ARGUMENTS
+    )
+    parser.add_argument(
+        "--no-rate-limits",
+        action="store_true",
+        help="Disable the client-side per-provider rate limiters",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load_test(
+            server_from_args(args),
+            num_arguments=args.arguments,
+            max_concurrency=args.concurrency,
+            rate_limits=not args.no_rate_limits,
+        )
+    )
+    logger.info(f"Load test finished in {report['elapsed_seconds']}s")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from commands.evaluate_arguments_command import EvaluateArgumentsCommand
 from commands.expand_node_command import ExpandNodeCommand
 from commands.generate_arguments_command import GenerateArgumentsCommand
 from commands.submit_argument_command import SubmitArgumentCommand
+from config import memoization_config
 from utils.logger import logger
 
 
@@ -22,12 +23,16 @@ class CommandInjector:
                 evaluation_service,
                 priority_queue_service,
                 score_aggregator_service,
+                memoization_config.CACHED_COMMANDS["expand_node_command"],
             ),
         )
         registry.register(
             "submit_argument_command",
             SubmitArgumentCommand(
-                evaluation_service, priority_queue_service, score_aggregator_service
+                evaluation_service,
+                priority_queue_service,
+                score_aggregator_service,
+                memoization_config.CACHED_COMMANDS["submit_argument_command"],
             ),
         )
         registry.register(
@@ -37,12 +42,15 @@ class CommandInjector:
                 evaluation_service,
                 priority_queue_service,
                 score_aggregator_service,
+                memoization_config.CACHED_COMMANDS["generate_arguments_command"],
             ),
         )
         registry.register(
             "evaluate_arguments_command",
             EvaluateArgumentsCommand(
-                evaluation_service, score_aggregator_service
+                evaluation_service,
+                score_aggregator_service,
+                memoization_config.CACHED_COMMANDS["evaluate_arguments_command"],
             ),  # Not too important to have
         )
 
@@ -1,6 +1,7 @@
 from services.evaluation_service import EvaluationService
 from services.score_aggregator_service import ScoreAggregatorService
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import metered
 
 
 class EvaluateArgumentsCommand:
@@ -8,23 +9,33 @@ class EvaluateArgumentsCommand:
         self,
         evaluation_service: EvaluationService,
         score_aggregator_service: ScoreAggregatorService,
+        use_cache: bool = True,
     ):
         self.evaluation_service = evaluation_service
         self.score_aggregator_service = score_aggregator_service
+        self.use_cache = use_cache
 
     @log_execution_time
+    @metered
     async def execute(self, arguments: list):
         logger.debug(f"Evaluating {len(arguments)} arguments")
-        evaluation_results = []
+        cache_stats = self.evaluation_service.get_cache_stats()
 
-        for i, argument in enumerate(arguments):
-            logger.debug(f"Evaluating argument {i + 1}")
-            result = await self.evaluation_service.evaluate_argument(argument)
-            evaluation_results.append(result)
+        evaluation_results = await self.evaluation_service.evaluate_many(
+            arguments, self.use_cache
+        )
+
+        logger.info(
+            f"Evaluation cache report: {self.evaluation_service.get_cache_stats(cache_stats)}"
+        )
+
+        unscored = evaluation_results.count(None)
+        if unscored:
+            logger.warning(f"{unscored} arguments could not be evaluated by any model")
 
         logger.debug("Aggregating scores from multiple models")
         aggregated_scores = self.score_aggregator_service.aggregate_scores(
-            evaluation_results
+            [result for result in evaluation_results if result is not None]
         )
 
         for i, score in enumerate(aggregated_scores):
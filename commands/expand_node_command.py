@@ -1,9 +1,10 @@
-from config import debate_tree_config  # MAX_CHILDREN_PER_NODE, MAX_TREE_DEPTH
+from config import debate_tree_config  # ARGUMENTS_PER_SIDE, MAX_TREE_DEPTH
 from services.argument_generation_service import ArgumentGenerationService
 from services.evaluation_service import EvaluationService
 from services.priority_queue_service import PriorityQueueService
 from services.score_aggregator_service import ScoreAggregatorService
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import metered, usage_meter
 
 
 class ExpandNodeCommand:
@@ -13,13 +14,16 @@ class ExpandNodeCommand:
         evaluation_service: EvaluationService,
         priority_queue_service: PriorityQueueService,
         score_aggregator_service: ScoreAggregatorService,
+        use_cache: bool = True,
     ):
         self.argument_generation_service = argument_generation_service
         self.evaluation_service = evaluation_service
         self.priority_queue_service = priority_queue_service
         self.score_aggregator_service = score_aggregator_service
+        self.use_cache = use_cache
 
     @log_execution_time
+    @metered
     async def execute(self, node_id: str):
         logger.debug(f"Attempting to expand node with ID {node_id}")
         # Retrieve the node from the priority queue
@@ -30,20 +34,27 @@ class ExpandNodeCommand:
             return
 
         category = node["category"]
+        # Every node of a debate tree shares its category
+        usage_meter.set_debate(category)
         support = f"Based on this argument: {node["argument"]}, make an argument that supports it further."
         against = f"Based on this argument: {node["argument"]}, make an argument that rebuttals this argument."
         # Expand the node like it was before in the generation arguments "make 3 more arguments that support this" and "make 3 more arguments that are against this"
         arguments = await self.argument_generation_service.generate_arguments(
-            "none", category, support, against, 1
-        )  # For now 1 from 3
+            "none", category, support, against, debate_tree_config.ARGUMENTS_PER_SIDE
+        )
 
         logger.info(f"Generated {len(arguments)} arguments. Starting evaluation.")
-        for i, argument in enumerate(arguments, 1):
-            logger.debug(f"Evaluating argument {i}/{len(arguments)}")
-            # Evaluate each generated argument
-            evaluation_results = await self.evaluation_service.evaluate_argument(
-                argument
-            )
+        cache_stats = self.evaluation_service.get_cache_stats()
+        # Evaluate all generated arguments concurrently
+        all_evaluation_results = await self.evaluation_service.evaluate_many(
+            arguments, self.use_cache
+        )
+        for i, (argument, evaluation_results) in enumerate(
+            zip(arguments, all_evaluation_results), 1
+        ):
+            if evaluation_results is None:
+                logger.warning(f"Skipping argument {i}: no model could evaluate it")
+                continue
             evaluation_result = self.score_aggregator_service.average_scores(
                 evaluation_results
             )
@@ -62,6 +73,9 @@ class ExpandNodeCommand:
         # Expand the node in the debate tree
         # expanded_nodes = await self.node_expansion_handler.expand_node(node)
 
+        logger.info(
+            f"Evaluation cache report: {self.evaluation_service.get_cache_stats(cache_stats)}"
+        )
         logger.info(
             f"Node {node_id} expanded successfully. Added {len(arguments)} new nodes."
         )
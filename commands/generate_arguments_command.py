@@ -1,8 +1,10 @@
+from config import debate_tree_config
 from services.argument_generation_service import ArgumentGenerationService
 from services.evaluation_service import EvaluationService
 from services.priority_queue_service import PriorityQueueService
 from services.score_aggregator_service import ScoreAggregatorService
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import metered, usage_meter
 
 
 class GenerateArgumentsCommand:
@@ -12,29 +14,42 @@ class GenerateArgumentsCommand:
         evaluation_service: EvaluationService,
         priority_queue_service: PriorityQueueService,
         score_aggregator_service: ScoreAggregatorService,
+        use_cache: bool = True,
     ):
         self.argument_generation_service = argument_generation_service
         self.evaluation_service = evaluation_service
         self.priority_queue_service = priority_queue_service
         self.score_aggregator_service = score_aggregator_service
+        self.use_cache = use_cache
 
     @log_execution_time
+    @metered
     async def execute(self, topic: str, subcategory: str, support: str, against: str):
         logger.info(
             f"Generating arguments for topic: {topic}, subcategory: {subcategory}"
         )
+        usage_meter.set_debate(subcategory)
         # Generate arguments
         arguments = await self.argument_generation_service.generate_arguments(
-            topic, subcategory, support, against, 1  # Changed from 3 to 1
+            topic,
+            subcategory,
+            support,
+            against,
+            debate_tree_config.ARGUMENTS_PER_SIDE,
         )
 
         logger.info(f"Generated {len(arguments)} arguments. Starting evaluation.")
-        for i, argument in enumerate(arguments, 1):
-            logger.debug(f"Evaluating argument {i}/{len(arguments)}")
-            # Evaluate each generated argument
-            evaluation_results = await self.evaluation_service.evaluate_argument(
-                argument
-            )
+        cache_stats = self.evaluation_service.get_cache_stats()
+        # Evaluate all generated arguments concurrently
+        all_evaluation_results = await self.evaluation_service.evaluate_many(
+            arguments, self.use_cache
+        )
+        for i, (argument, evaluation_results) in enumerate(
+            zip(arguments, all_evaluation_results), 1
+        ):
+            if evaluation_results is None:
+                logger.warning(f"Skipping argument {i}: no model could evaluate it")
+                continue
             evaluation_result = self.score_aggregator_service.average_scores(
                 evaluation_results
             )
@@ -53,6 +68,9 @@ class GenerateArgumentsCommand:
             self.priority_queue_service.add_node(new_node)
             logger.debug(f"Added argument {i} to priority queue")
 
+        logger.info(
+            f"Evaluation cache report: {self.evaluation_service.get_cache_stats(cache_stats)}"
+        )
         logger.info(
             f"Generated and evaluated {len(arguments)} arguments for {subcategory} in {topic}."
         )
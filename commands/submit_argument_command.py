@@ -1,7 +1,8 @@
-from services.evaluation_service import EvaluationService
+from services.evaluation_service import EvaluationService, NoModelAvailableError
 from services.priority_queue_service import PriorityQueueService
 from services.score_aggregator_service import ScoreAggregatorService
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import metered, usage_meter
 
 
 class SubmitArgumentCommand:
@@ -10,23 +11,37 @@ class SubmitArgumentCommand:
         evaluation_service: EvaluationService,
         priority_queue_service: PriorityQueueService,
         score_aggregator_service: ScoreAggregatorService,
+        use_cache: bool = True,
     ):
         self.evaluation_service = evaluation_service
         self.priority_queue_service = priority_queue_service
         self.score_aggregator_service = score_aggregator_service
+        self.use_cache = use_cache
 
     @log_execution_time
+    @metered
     async def execute(self, argument: str, category: str):
         logger.debug(f"Submitting and evaluating argument in category: {category}")
+        usage_meter.set_debate(category)
 
         # Evaluate the submitted argument
 
-        evaluation_results = await self.evaluation_service.evaluate_argument(argument)
+        cache_stats = self.evaluation_service.get_cache_stats()
+        try:
+            evaluation_results = await self.evaluation_service.evaluate_argument(
+                argument, self.use_cache
+            )
+        except NoModelAvailableError as e:
+            logger.error(f"Argument not submitted: {str(e)}")
+            return
         evaluation_result = self.score_aggregator_service.average_scores(
             evaluation_results
         )
 
         logger.debug("Argument evaluation completed")
+        logger.info(
+            f"Evaluation cache report: {self.evaluation_service.get_cache_stats(cache_stats)}"
+        )
 
         # Create a new node with the argument and its evaluation
         new_node = {
@@ -1,6 +1,90 @@
+from .environment import get_env_variable
+
+
 class ApiConfig:
     MAX_RETRIES = 3
-    RETRY_DELAY = 2  # seconds
+    RETRY_DELAY = 2  # seconds, doubled after every retry
+    RETRY_MAX_DELAY = 30  # seconds between two attempts
+    RETRY_MAX_TOTAL_TIME = 120  # seconds spent retrying one call
+
+    # Connection pool shared by all requests of one API client
+    CONNECTION_LIMIT = 100
+    CONNECTION_LIMIT_PER_HOST = 20
+    KEEPALIVE_TIMEOUT = 30  # seconds
+    DNS_CACHE_TTL = 300  # seconds
+
+    # Per-provider request and token budgets; None leaves a budget unenforced
+    RATE_LIMITS = {
+        "ChatGPT": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+        "Claude": {"requests_per_minute": 50, "tokens_per_minute": 40000},
+    }
+
+    # Adaptive (AIMD) cap on each provider's requests in flight: grows by
+    # ADAPTIVE_INCREASE_STEP per round of healthy responses and is multiplied
+    # by ADAPTIVE_DECREASE_FACTOR on 429/5xx or a response slower than
+    # ADAPTIVE_LATENCY_SPIKE_FACTOR times the usual latency. Providers left out
+    # are not capped.
+    ADAPTIVE_CONCURRENCY = {
+        "ChatGPT": {"initial_limit": 8, "min_limit": 1, "max_limit": 64},
+        "Claude": {"initial_limit": 4, "min_limit": 1, "max_limit": 32},
+    }
+    ADAPTIVE_INCREASE_STEP = 1
+    ADAPTIVE_DECREASE_FACTOR = 0.5
+    ADAPTIVE_LATENCY_SPIKE_FACTOR = 3.0
+
+    # Deadline for one attempt of a call, per provider and operation, in
+    # seconds; None waits indefinitely. A timed-out attempt is retried.
+    REQUEST_TIMEOUTS = {
+        "ChatGPT": {"evaluate": 30, "generate_text": 90},
+        "Claude": {"evaluate": 30, "generate_text": 90},
+    }
+
+    # Hedging sends a duplicate of a call still pending after the
+    # HEDGE_PERCENTILE latency of the recent calls and keeps the first reply
+    HEDGING = {
+        "ChatGPT": {"evaluate": False, "generate_text": False},
+        "Claude": {"evaluate": False, "generate_text": False},
+    }
+    HEDGE_PERCENTILE = 95
+    HEDGE_LATENCY_WINDOW = 200  # most recent latencies kept per operation
+    HEDGE_MIN_SAMPLES = 20  # latencies needed before hedging starts
+
+    # Operations whose identical concurrent requests share one API call.
+    # Generated text is sampled, so identical generation requests each need
+    # their own call to get distinct completions.
+    COALESCED_OPERATIONS = ["evaluate"]
+
+    # On-disk cache of raw API responses, keyed by a hash of the request body.
+    # Off by default; meant for regression and replay runs. Only the listed
+    # operations are cached, so generated text is never served stale, and
+    # evaluations run with use_cache=False skip it.
+    RESPONSE_CACHE_ENABLED = False
+    RESPONSE_CACHE_OPERATIONS = ["evaluate"]
+    RESPONSE_CACHE_DIR = "data/api_responses"
+    RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # None keeps every response
+
+    # Cassette of recorded API exchanges: "record" writes every request and
+    # response to API_CASSETTE_PATH, "replay" answers from it without network
+    # access, "off" disables both. Replay can sleep for the recorded latency.
+    API_CASSETTE_MODE = get_env_variable("API_CASSETTE_MODE", "off")
+    API_CASSETTE_PATH = get_env_variable("API_CASSETTE_PATH", "data/api_cassette.jsonl")
+    API_CASSETTE_REPLAY_TIMING = get_env_variable("API_CASSETTE_REPLAY_TIMING", False)
+
+    # USD per million tokens, used to price the usage the providers report
+    TOKEN_PRICES = {
+        "gpt-3.5-turbo": {"prompt": 0.5, "completion": 1.5},
+        "claude-3-5-sonnet-20241022": {"prompt": 3.0, "completion": 15.0},
+    }
+    # Token budgets for one command invocation, one debate tree and the whole
+    # session; None leaves a budget unenforced. When a request would exceed a
+    # budget, "refuse" fails it and "degrade" clamps its max_tokens instead.
+    TOKEN_BUDGETS = {"command": None, "debate": None, "total": None}
+    TOKEN_BUDGET_MODE = "degrade"
+    # Usage rolled up per model, command and debate, written at shutdown
+    USAGE_REPORT_PATH = "data/usage_report.json"
+
+    # Rough characters-per-token ratio used to estimate prompt tokens
+    CHARS_PER_TOKEN = 4
 
 
 api_config = ApiConfig()
@@ -2,5 +2,13 @@ class DebateTreeConfig:
     MAX_TREE_DEPTH = 5  # Currently not used, TODO
     MAX_CHILDREN_PER_NODE = 3  # Currently not used, TODO
 
+    # Arguments generated per side (supporting and against) for a topic or node
+    ARGUMENTS_PER_SIDE = 3
+    # How the arguments of one side are requested: "json_list" asks for a JSON
+    # array of all of them in one reply, "n" asks the chat API for several
+    # choices, "per_argument" sends one request each. Batched modes fall back
+    # to per-argument requests for any argument they do not return.
+    ARGUMENT_GENERATION_MODE = "json_list"
+
 
 debate_tree_config = DebateTreeConfig()
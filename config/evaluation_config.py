@@ -4,5 +4,33 @@ class EvaluationConfig:
     CULTURAL_ACCEPTANCE = "cultural_acceptance"
     FACTUAL_ACCURACY = "factual_accuracy"
 
+    # Criteria scored for every argument; each needs an evaluate_<criterion> model method
+    CRITERIA = [COHERENCE, PERSUASION, CULTURAL_ACCEPTANCE, FACTUAL_ACCURACY]
+
+    # Maximum number of (model, criterion) evaluation calls in flight at once
+    MAX_CONCURRENT_CALLS = 8
+
+    # Maximum number of arguments evaluated at once by evaluate_many
+    MAX_CONCURRENT_ARGUMENTS = 4
+
+    # How each model is asked for scores: "per_criterion" sends one request per
+    # criterion, "single_call" asks for every criterion as one JSON object and
+    # falls back to per-criterion requests if the reply does not parse
+    EVALUATION_MODES = {"ChatGPT": "per_criterion", "Claude": "per_criterion"}
+    MULTI_CRITERIA_MAX_TOKENS = 100
+
+    # Circuit breaker guarding each model. It opens when the failure or slow
+    # call rate over the model's last CIRCUIT_BREAKER_WINDOW API requests
+    # reaches its threshold, skips the model for CIRCUIT_BREAKER_OPEN_SECONDS,
+    # then closes again once CIRCUIT_BREAKER_HALF_OPEN_CALLS requests succeed.
+    # Slow calls are judged on provider latency, excluding local queueing.
+    CIRCUIT_BREAKER_WINDOW = 20
+    CIRCUIT_BREAKER_MIN_CALLS = 5
+    CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS = 30
+    CIRCUIT_BREAKER_SLOW_CALL_RATE = 0.8
+    CIRCUIT_BREAKER_OPEN_SECONDS = 60
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS = 2
+
 
 evaluation_config = EvaluationConfig()
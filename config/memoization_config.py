@@ -2,11 +2,57 @@ class MemoizationConfig:
     # Semantic similarity model
     SEMANTIC_SIMILARITY_MODEL = "all-MiniLM-L6-v2"
 
+    # Number of texts encoded per SentenceTransformer forward pass
+    EMBEDDING_BATCH_SIZE = 64
+
     # Cache file path
     CACHE_FILE_PATH = "data/argument_cache.json"
 
+    # Cache storage backend: "json" rewrites the file on every store,
+    # "journal" appends records and periodically compacts them into the file,
+    # "sqlite" shares one WAL-mode database between evaluator processes
+    CACHE_BACKEND = "json"
+
+    # Number of journal records appended before a snapshot is rewritten
+    JOURNAL_COMPACTION_INTERVAL = 1000
+
+    # SQLite database path
+    SQLITE_CACHE_PATH = "data/argument_cache.sqlite3"
+
+    # Lookups against a shared backend re-read entries stored this many seconds
+    # before the previous sync, catching stores whose commit waited on a lock
+    INDEX_SYNC_OVERLAP_SECONDS = 5.0
+
+    # Cache bounds; None disables a limit. Entries past max_entries/max_bytes are
+    # evicted least recently used first ("lru") or oldest stored first ("fifo")
+    CACHE_MAX_ENTRIES = None
+    CACHE_MAX_BYTES = None
+    CACHE_TTL_SECONDS = None
+    CACHE_EVICTION_POLICY = "lru"
+
+    # Persisted embedding store path prefix and on-disk dtype (float32 or float16)
+    EMBEDDING_STORE_PATH = "data/argument_embeddings"
+    EMBEDDING_STORE_DTYPE = "float32"
+
+    # Approximate nearest-neighbour (IVF) search for large caches. Searches only
+    # score rows in the ANN_NUM_PROBES closest of ANN_NUM_LISTS clusters (None
+    # uses the square root of the entry count); more probes raise recall.
+    ANN_ENABLED = False
+    ANN_MIN_ENTRIES = 10000
+    ANN_NUM_LISTS = None
+    ANN_NUM_PROBES = 8
+    ANN_INDEX_PATH = "data/argument_ann_index.npz"
+
     # Similarity threshold for considering arguments as similar
     SIMILARITY_THRESHOLD = 0.95
 
+    # Commands that read and populate the evaluation cache, by registry name
+    CACHED_COMMANDS = {
+        "expand_node_command": True,
+        "submit_argument_command": True,
+        "generate_arguments_command": True,
+        "evaluate_arguments_command": True,
+    }
+
 
 memoization_config = MemoizationConfig()
@@ -1,8 +1,10 @@
+from .circuit_breaker import CircuitBreaker
 from .evaluation_injector import EvaluationInjector
 from .model_factory import ModelFactory
 from .score_aggregator import ScoreAggregator
 
 __all__ = [
+    "CircuitBreaker",
     "EvaluationInjector",
     "ModelFactory",
     "ScoreAggregator",
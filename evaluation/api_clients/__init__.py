@@ -1,9 +1,24 @@
+from .adaptive_limiter import AdaptiveConcurrencyLimiter, get_adaptive_limiter
+from .api_errors import APIRequestError
 from .base_api_client import BaseAPIClient
+from .cassette import Cassette, get_cassette
 from .chatgpt_api_client import ChatGPTAPIClient
 from .claude_api_client import ClaudeAPIClient
+from .rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+from .response_cache import ResponseCache
+from .retry_policy import RetryPolicy
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "APIRequestError",
     "BaseAPIClient",
+    "Cassette",
     "ChatGPTAPIClient",
     "ClaudeAPIClient",
+    "ResponseCache",
+    "RetryPolicy",
+    "TokenBucketRateLimiter",
+    "get_adaptive_limiter",
+    "get_cassette",
+    "get_rate_limiter",
 ]
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict
+
+from config import api_config
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Caps the requests a provider has in flight with an AIMD controller.
+
+    Every healthy response grows the limit by ``increase_step / limit``, which
+    adds about ``increase_step`` per round of requests. A 429, a 5xx or a
+    response slower than ``latency_spike_factor`` times the smoothed latency
+    of its request class multiplies the limit by ``decrease_factor``. Spikes
+    still move the smoothed latency, by ``spike_smoothing`` rather than
+    ``latency_smoothing``, so a provider that becomes slower for good stops
+    looking overloaded once the baseline catches up.
+    Decreases are spaced at least one smoothed latency apart, so a burst of
+    failures from the same round only cuts the limit once. Callers waiting
+    for a slot are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase_step: float = api_config.ADAPTIVE_INCREASE_STEP,
+        decrease_factor: float = api_config.ADAPTIVE_DECREASE_FACTOR,
+        latency_spike_factor: float = api_config.ADAPTIVE_LATENCY_SPIKE_FACTOR,
+        latency_smoothing: float = 0.1,
+        spike_smoothing: float = 0.02,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.latency_smoothing = latency_smoothing
+        self.spike_smoothing = spike_smoothing
+        # Exponential moving average of latency per request class, in seconds.
+        # Classes separate operations and completion sizes, whose latencies differ
+        self.baseline_latency: Dict[str, float] = {}
+        self.last_decrease = 0.0
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._publish()
+
+    async def acquire(self) -> None:
+        # Queued callers are served first so new arrivals cannot barge ahead
+        if not self._waiters and self.in_flight < int(self.limit):
+            self._take_slot()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # _wake() takes the slot on the waiter's behalf before resolving it
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just before being cancelled; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        metrics.set_gauge(f"{self.name}.in_flight", self.in_flight)
+        self._wake()
+
+    def _take_slot(self) -> None:
+        self.in_flight += 1
+        metrics.set_gauge(f"{self.name}.in_flight", self.in_flight)
+
+    def _wake(self) -> None:
+        # Hands free slots to waiters in arrival order
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take_slot()
+                waiter.set_result(None)
+
+    def is_latency_spike(self, request_class: str, latency: float) -> bool:
+        baseline = self.baseline_latency.get(request_class)
+        return baseline is not None and latency > baseline * self.latency_spike_factor
+
+    def on_success(self, request_class: str, latency: float) -> None:
+        spike = self.is_latency_spike(request_class, latency)
+        smoothing = self.spike_smoothing if spike else self.latency_smoothing
+        baseline = self.baseline_latency.get(request_class, latency)
+        self.baseline_latency[request_class] = baseline + smoothing * (
+            latency - baseline
+        )
+        if spike:
+            self.on_overload(f"{request_class} latency spike of {latency:.2f}s")
+            return
+
+        self.limit = min(self.max_limit, self.limit + self.increase_step / self.limit)
+        self._publish()
+        self._wake()
+
+    def on_overload(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self.last_decrease < min(self.baseline_latency.values(), default=0.0):
+            return
+        self.last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        metrics.increment(f"{self.name}.concurrency_decreases")
+        logger.warning(
+            f"{self.name} concurrency limit cut from {previous:.1f} to "
+            f"{self.limit:.1f} after {reason}"
+        )
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"{self.name}.concurrency_limit", round(self.limit, 2))
+
+
+_adaptive_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_adaptive_limiter(provider: str) -> AdaptiveConcurrencyLimiter | None:
+    """
+    Returns the limiter shared by every client of ``provider``, or None when
+    the provider has no adaptive concurrency settings.
+    """
+    settings = api_config.ADAPTIVE_CONCURRENCY.get(provider)
+    if settings is None:
+        return None
+    if provider not in _adaptive_limiters:
+        _adaptive_limiters[provider] = AdaptiveConcurrencyLimiter(
+            provider,
+            settings["initial_limit"],
+            settings["min_limit"],
+            settings["max_limit"],
+        )
+    return _adaptive_limiters[provider]
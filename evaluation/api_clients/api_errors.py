@@ -0,0 +1,22 @@
+class APIRequestError(Exception):
+    """
+    Raised when a provider request fails. ``retryable`` marks transient
+    failures (network errors, throttling, server errors) worth retrying;
+    ``retry_after`` carries the provider's requested delay in seconds.
+    """
+
+    RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        retry_after: float | None = None,
+        retryable: bool | None = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        if retryable is None:
+            retryable = status in self.RETRYABLE_STATUSES
+        self.retryable = retryable
@@ -1,15 +1,349 @@
+import asyncio
+import hashlib
+import json
+import time
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple
+
+import aiohttp
+from aiohttp import ClientError
 
 from config import api_config
-from utils.logger import log_execution_time
+from evaluation.circuit_breaker import CircuitBreaker
+from utils.async_utils import run_with_timeout
+from utils.logger import log_execution_time, logger
+from utils.metrics import metrics
+from utils.usage_meter import usage_meter
+
+from .adaptive_limiter import get_adaptive_limiter
+from .api_errors import APIRequestError
+from .cassette import RECORD, REPLAY, get_cassette
+from .hedging import LatencyWindow, run_hedged
+from .rate_limiter import get_rate_limiter
+from .response_cache import ResponseCache, response_cache_bypassed
+from .retry_policy import RetryPolicy
 
 
 class BaseAPIClient(ABC):
+    # Provider name used to look up per-provider settings in api_config
+    provider_name: str = ""
+
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+        self.rate_limiter = get_rate_limiter(self.provider_name)
+        self.retry_policy = RetryPolicy(self.provider_name)
+        self.concurrency_limiter = get_adaptive_limiter(self.provider_name)
+        # Breaker of the model using this client, fed the outcome of every
+        # request; set by ModelFactory.register_model
+        self.circuit_breaker: CircuitBreaker | None = None
+        # Coalesced requests currently on the wire, keyed by their fingerprint,
+        # and the number of callers awaiting each
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        # Recent latencies of each request class, used to pick the hedging delay
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self.cassette = get_cassette()
+        self.response_cache = (
+            ResponseCache(
+                api_config.RESPONSE_CACHE_DIR, api_config.RESPONSE_CACHE_MAX_BYTES
+            )
+            if api_config.RESPONSE_CACHE_ENABLED
+            else None
+        )
+
+    async def start(self) -> None:
+        """
+        Opens the pooled session shared by every request from this client.
+        """
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=api_config.CONNECTION_LIMIT,
+            limit_per_host=api_config.CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=api_config.KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=api_config.DNS_CACHE_TTL,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        logger.info(f"{type(self).__name__} session started")
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info(f"{type(self).__name__} session closed")
+        self._session = None
+
+    @staticmethod
+    def _estimate_tokens(data: Dict[str, Any]) -> int:
+        """
+        Estimates the tokens a request consumes: its prompt text plus max_tokens
+        for each of the ``n`` completions it asks for.
+        """
+        prompt = json.dumps(data.get("messages", [])) + str(data.get("system") or "")
+        completion = data.get("max_tokens", 0) * data.get("n", 1)
+        return len(prompt) // api_config.CHARS_PER_TOKEN + completion
+
+    def _fingerprint(self, data: Dict[str, Any]) -> str:
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(f"{self.api_endpoint}\n{payload}".encode("utf-8")).hexdigest()
+
+    def _cassette_key(self, data: Dict[str, Any]) -> str:
+        # Unlike _fingerprint this ignores the endpoint, so a cassette recorded
+        # against one deployment replays against any other
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(f"{self.provider_name}\n{payload}".encode("utf-8")).hexdigest()
+
+    async def _post(
+        self, data: Dict[str, Any], operation: str = "evaluate"
+    ) -> Dict[str, Any]:
+        """
+        Sends a request within the token budgets, recording the exchange or
+        replaying it from the cassette when API_CASSETTE_MODE enables one.
+        """
+        max_tokens = data.get("max_tokens", 0)
+        choices = data.get("n", 1)
+        allowed, reservation = usage_meter.reserve(
+            self._estimate_tokens(data) - max_tokens * choices, max_tokens, choices
+        )
+        if allowed != max_tokens:
+            data = {**data, "max_tokens": allowed}
+
+        try:
+            if self.cassette is not None and self.cassette.mode == REPLAY:
+                return await self.cassette.replay(
+                    self._cassette_key(data), self.provider_name
+                )
+            return await self._request(data, operation)
+        finally:
+            usage_meter.release(reservation)
+
+    async def _request(self, data: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        """
+        Sends a request, coalescing it with an identical one already in flight
+        when its operation is listed in COALESCED_OPERATIONS.
+
+        Responses already in the response cache are returned without any
+        network I/O. Otherwise every concurrent caller awaits the same task,
+        so they all receive the same response or the same exception, and each
+        is charged the response's token usage. A cancelled caller does not
+        cancel the shared request for the others, but the last one to go does.
+        Requests that are not coalesced are cancelled with their caller.
+        """
+        key = self._fingerprint(data)
+        use_response_cache = (
+            self.response_cache is not None
+            and operation in api_config.RESPONSE_CACHE_OPERATIONS
+            and not response_cache_bypassed()
+        )
+        if use_response_cache:
+            response = self.response_cache.get(key)
+            if response is not None:
+                metrics.increment(f"{self.provider_name}.response_cache_hits")
+                self._record_cassette(data, response, 0.0)
+                return response
+
+        if self._session is None or self._session.closed:
+            await self.start()
+
+        if operation not in api_config.COALESCED_OPERATIONS:
+            response = await self._fetch(key, data, operation, use_response_cache)
+            usage_meter.attribute(self.model, *self._extract_usage(response))
+            return response
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch(key, data, operation, use_response_cache)
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+        else:
+            metrics.increment(f"{self.provider_name}.coalesced_requests")
+            logger.debug(f"Coalescing identical in-flight {self.provider_name} request")
+
+        response = await self._await_shared(key, task)
+        # The shared task runs in the first caller's context, so each caller
+        # charges the usage to its own command and debate here
+        usage_meter.attribute(self.model, *self._extract_usage(response))
+        return response
+
+    async def _await_shared(self, key: str, task: asyncio.Task) -> Dict[str, Any]:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                # Nobody else wants the response; later identical requests
+                # start afresh instead of joining the cancelled one
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _fetch(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        operation: str,
+        use_response_cache: bool,
+    ) -> Dict[str, Any]:
+        started_at = time.monotonic()
+        response = await self.retry_policy.run(lambda: self._attempt(data, operation))
+        # Recorded once per upstream request, not once per coalesced caller
+        self._record_cassette(data, response, time.monotonic() - started_at)
+        if use_response_cache:
+            self.response_cache.put(key, response)
+        return response
+
+    def _record_cassette(
+        self, data: Dict[str, Any], response: Dict[str, Any], elapsed: float
+    ) -> None:
+        if self.cassette is not None and self.cassette.mode == RECORD:
+            self.cassette.record(
+                self._cassette_key(data), self.provider_name, data, response, elapsed
+            )
+
+    def _request_done(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the error as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _request_class(data: Dict[str, Any], operation: str) -> str:
+        # Latency grows with the completion length, so latency statistics are
+        # kept per operation and requested completion size
+        return f"{operation}/{data.get('max_tokens', 0) * data.get('n', 1)}"
+
+    def _latency_window(self, request_class: str) -> LatencyWindow:
+        if request_class not in self.latencies:
+            self.latencies[request_class] = LatencyWindow(
+                api_config.HEDGE_LATENCY_WINDOW, api_config.HEDGE_MIN_SAMPLES
+            )
+        return self.latencies[request_class]
+
+    async def _attempt(self, data: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        """
+        Makes one attempt of a call under the operation's deadline, hedging it
+        when enabled and enough latencies have been observed. The rate limiter
+        and the adaptive concurrency slot are acquired before the deadline
+        starts, so time spent queued locally never causes a timeout.
+        """
+        await self.rate_limiter.acquire(self._estimate_tokens(data))
+        limiter = self.concurrency_limiter
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            return await self._attempt_with_deadline(data, operation)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    async def _attempt_with_deadline(
+        self, data: Dict[str, Any], operation: str
+    ) -> Dict[str, Any]:
+        hedge_after = None
+        if api_config.HEDGING.get(self.provider_name, {}).get(operation):
+            window = self._latency_window(self._request_class(data, operation))
+            hedge_after = window.percentile(api_config.HEDGE_PERCENTILE)
+
+        if hedge_after is None:
+            request = self._send(data, operation)
+        else:
+            request = run_hedged(
+                lambda: self._send(data, operation),
+                lambda: self._send_hedge(data, operation),
+                hedge_after,
+                f"{self.provider_name} {operation}",
+            )
+
+        timeout = api_config.REQUEST_TIMEOUTS.get(self.provider_name, {}).get(operation)
+        if timeout is None:
+            return await request
+        try:
+            return await run_with_timeout(request, timeout)
+        except asyncio.TimeoutError:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            raise
+
+    async def _send_hedge(self, data: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        metrics.increment(f"{self.provider_name}.hedged_requests")
+        await self.rate_limiter.acquire(self._estimate_tokens(data))
+        # The hedge is a second request in flight and needs a slot of its own
+        limiter = self.concurrency_limiter
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            return await self._send(data, operation)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    async def _send(self, data: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        """
+        Makes the HTTP call. The caller holds an adaptive concurrency slot.
+        """
+        limiter = self.concurrency_limiter
+        request_class = self._request_class(data, operation)
+        started = time.monotonic()
+        try:
+            async with self._session.post(
+                self.api_endpoint, headers=self._get_headers(), json=data
+            ) as response:
+                await self._check_response(response)
+                result = await response.json()
+        except ClientError as e:
+            logger.error(f"API request failed: {str(e)}")
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            raise APIRequestError(f"API request failed: {str(e)}", retryable=True)
+        except APIRequestError as e:
+            if e.status is not None and (e.status == 429 or e.status >= 500):
+                if limiter is not None:
+                    limiter.on_overload(f"status {e.status}")
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Deadlines and lost hedges cancel the request; only a long wait
+            # says something about the provider
+            elapsed = time.monotonic() - started
+            if limiter is not None and limiter.is_latency_spike(request_class, elapsed):
+                limiter.on_overload(f"{request_class} cancelled after {elapsed:.2f}s")
+            raise
+
+        latency = time.monotonic() - started
+        self._latency_window(request_class).record(latency)
+        usage_meter.record(self.model, *self._extract_usage(result))
+        if limiter is not None:
+            limiter.on_success(request_class, latency)
+        if self.circuit_breaker is not None:
+            # Timed from after every local wait, so only provider latency counts
+            self.circuit_breaker.record_success(latency)
+        return result
+
     @abstractmethod
     @log_execution_time
     async def evaluate(self, prompt: str) -> float:
         pass
 
+    @abstractmethod
+    @log_execution_time
+    async def evaluate_text(
+        self, system_message: str, prompt: str, max_tokens: int = 20
+    ) -> str:
+        """
+        Sends an evaluation request and returns the reply unparsed, for
+        replies that carry several scores.
+        """
+        pass
+
     @abstractmethod
     def _get_headers(self):
         pass
@@ -25,3 +359,10 @@ class BaseAPIClient(ABC):
     @abstractmethod
     def _extract_score(self, result):
         pass
+
+    @abstractmethod
+    def _extract_usage(self, result) -> Tuple[int, int]:
+        """
+        Returns the (prompt, completion) tokens the provider reports.
+        """
+        pass
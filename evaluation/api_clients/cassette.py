@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from config import api_config
+from utils.logger import logger
+
+from .api_errors import APIRequestError
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+
+class Cassette:
+    """
+    Records API request/response pairs to a JSONL file and serves them back.
+
+    Each line holds the request key, provider, request body, response and the
+    seconds the original call took. On replay, the n-th request with a given
+    key gets the n-th recorded response for that key, so a session that sends
+    the same prompt several times replays each answer in order. Once a key's
+    recordings are used up its last response is repeated.
+    """
+
+    def __init__(self, path: str, mode: str, replay_timing: bool = False):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_timing = replay_timing
+        self.recordings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.replayed: Dict[str, int] = defaultdict(int)
+
+        if mode == RECORD:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Every recording session starts a fresh cassette
+            open(self.path, "w").close()
+            logger.info(f"Recording API cassette to {self.path}")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Skipping unreadable cassette line {line_number} in {self.path}"
+                    )
+                    continue
+                self.recordings[entry["key"]].append(entry)
+        logger.info(
+            f"Replaying {sum(map(len, self.recordings.values()))} recorded API "
+            f"responses from {self.path}"
+        )
+
+    def record(
+        self,
+        key: str,
+        provider: str,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        elapsed: float,
+    ) -> None:
+        entry = {
+            "key": key,
+            "provider": provider,
+            "request": request,
+            "response": response,
+            "elapsed": round(elapsed, 4),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    async def replay(self, key: str, provider: str) -> Dict[str, Any]:
+        entries = self.recordings.get(key)
+        if not entries:
+            raise APIRequestError(
+                f"No {provider} response recorded for request {key[:12]} in {self.path}",
+                retryable=False,
+            )
+
+        index = min(self.replayed[key], len(entries) - 1)
+        self.replayed[key] += 1
+        entry = entries[index]
+        if self.replay_timing:
+            await asyncio.sleep(entry["elapsed"])
+        return entry["response"]
+
+
+_cassettes: Dict[str, Cassette] = {}
+
+
+def get_cassette() -> Cassette | None:
+    """
+    Returns the cassette shared by every client, or None when the mode is off.
+    """
+    mode = api_config.API_CASSETTE_MODE
+    if mode == OFF:
+        return None
+    if mode not in _cassettes:
+        _cassettes[mode] = Cassette(
+            api_config.API_CASSETTE_PATH, mode, api_config.API_CASSETTE_REPLAY_TIMING
+        )
+    return _cassettes[mode]
@@ -1,16 +1,20 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 import aiohttp
-from aiohttp import ClientError
 
 from config.environment import environment_config, get_env_variable
 from utils.logger import log_execution_time, logger
 
+from .api_errors import APIRequestError
 from .base_api_client import BaseAPIClient
+from .retry_policy import parse_retry_after
 
 
 class ChatGPTAPIClient(BaseAPIClient):
+    provider_name = "ChatGPT"
+
     def __init__(self):
+        super().__init__()
         self.api_key = get_env_variable("CHATGPT_API_KEY")
         self.api_endpoint = get_env_variable("CHATGPT_API_ENDPOINT")
         self.model = "gpt-3.5-turbo"
@@ -21,24 +25,26 @@ class ChatGPTAPIClient(BaseAPIClient):
         self, system_message: str, prompt: str, max_tokens: int = 20
     ) -> float:
         logger.info(f"Evaluating prompt: {prompt[:50]}...")
-        headers = self._get_headers()
         data = self._prepare_request_data(
             prompt, system_message=system_message, max_tokens=max_tokens
         )
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_endpoint, headers=headers, json=data
-                ) as response:
-                    await self._check_response(response)
-                    result = await response.json()
-                    score = self._extract_score(result)
-                    logger.info(f"Evaluation completed. Score: {score}")
-                    return score
-        except ClientError as e:
-            logger.error(f"API request failed: {str(e)}")
-            raise Exception(f"API request failed: {str(e)}")
+        result = await self._post(data)
+        score = self._extract_score(result)
+        logger.info(f"Evaluation completed. Score: {score}")
+        return score
+
+    @log_execution_time
+    async def evaluate_text(
+        self, system_message: str, prompt: str, max_tokens: int = 20
+    ) -> str:
+        logger.info(f"Evaluating prompt: {prompt[:50]}...")
+        data = self._prepare_request_data(
+            prompt, system_message=system_message, max_tokens=max_tokens
+        )
+
+        result = await self._post(data)
+        return result["choices"][0]["message"]["content"]
 
     async def generate_text(
         self,
@@ -47,25 +53,36 @@ class ChatGPTAPIClient(BaseAPIClient):
         max_tokens: int = environment_config.MAX_TOKENS,
     ) -> str:
         logger.info(f"Generating text for prompt: {prompt[:50]}...")
-        headers = self._get_headers()
         data = self._prepare_request_data(
             prompt, system_message=system_message, max_tokens=max_tokens
         )
 
         print("Generating argument from CHATGPT API")
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_endpoint, headers=headers, json=data
-                ) as response:
-                    await self._check_response(response)
-                    result = await response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    logger.info(f"Text generation completed")
-                    return content
-        except ClientError as e:
-            logger.error(f"API request failed: {str(e)}")
-            raise Exception(f"API request failed: {str(e)}")
+        result = await self._post(data, "generate_text")
+        content = result["choices"][0]["message"]["content"]
+        logger.info(f"Text generation completed")
+        return content
+
+    async def generate_texts(
+        self,
+        system_message: str,
+        prompt: str,
+        n: int,
+        max_tokens: int = environment_config.MAX_TOKENS,
+    ) -> List[str]:
+        """
+        Generates ``n`` completions of one prompt with a single request.
+        """
+        logger.info(f"Generating {n} texts for prompt: {prompt[:50]}...")
+        data = self._prepare_request_data(
+            prompt, system_message=system_message, max_tokens=max_tokens
+        )
+        data["n"] = n
+
+        result = await self._post(data, "generate_text")
+        contents = [choice["message"]["content"] for choice in result["choices"]]
+        logger.info(f"Generated {len(contents)} texts")
+        return contents
 
     def _get_headers(self) -> Dict[str, str]:
         return {
@@ -97,8 +114,10 @@ class ChatGPTAPIClient(BaseAPIClient):
             logger.error(
                 f"API request failed with status {response.status}: {error_detail}"
             )
-            raise Exception(
-                f"API request failed with status {response.status}: {error_detail}"
+            raise APIRequestError(
+                f"API request failed with status {response.status}: {error_detail}",
+                status=response.status,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
             )
 
     def _extract_score(self, result: Dict[str, Any]) -> float:
@@ -109,3 +128,7 @@ class ChatGPTAPIClient(BaseAPIClient):
         except (KeyError, ValueError, IndexError) as e:
             logger.error(f"Failed to extract score from API response: {str(e)}")
             raise Exception(f"Failed to extract score from API response: {str(e)}")
+
+    def _extract_usage(self, result: Dict[str, Any]) -> Tuple[int, int]:
+        usage = result.get("usage") or {}
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
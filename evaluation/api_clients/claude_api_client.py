@@ -1,16 +1,20 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import aiohttp
-from aiohttp import ClientError
 
-from config.environment import get_env_variable
+from config.environment import environment_config, get_env_variable
 from utils.logger import log_execution_time, logger
 
+from .api_errors import APIRequestError
 from .base_api_client import BaseAPIClient
+from .retry_policy import parse_retry_after
 
 
 class ClaudeAPIClient(BaseAPIClient):
+    provider_name = "Claude"
+
     def __init__(self):
+        super().__init__()
         self.api_key = get_env_variable("CLAUDE_API_KEY")
         self.api_endpoint = get_env_variable("CLAUDE_API_ENDPOINT")
         self.model = "claude-3-5-sonnet-20241022"
@@ -21,27 +25,42 @@ class ClaudeAPIClient(BaseAPIClient):
         self, system_message: str, prompt: str, max_tokens: int = 20
     ) -> float:
         logger.info(f"Evaluating prompt: {prompt[:50]}...")
-        headers = self._get_headers()
         data = self._prepare_request_data(
             prompt, system_message=system_message, max_tokens=max_tokens
         )
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_endpoint, headers=headers, json=data
-                ) as response:
-                    await self._check_response(response)
-
-                    result = await response.json()
-                    score = self._extract_score(result)
-                    logger.info(f"Evaluation completed. Score: {score}")
-                    return score
-        except ClientError as e:
-            logger.error(f"API request failed: {str(e)}")
-            raise Exception(f"API request failed: {str(e)}")
-        finally:
-            await session.close()
+        result = await self._post(data)
+        score = self._extract_score(result)
+        logger.info(f"Evaluation completed. Score: {score}")
+        return score
+
+    @log_execution_time
+    async def evaluate_text(
+        self, system_message: str, prompt: str, max_tokens: int = 20
+    ) -> str:
+        logger.info(f"Evaluating prompt: {prompt[:50]}...")
+        data = self._prepare_request_data(
+            prompt, system_message=system_message, max_tokens=max_tokens
+        )
+
+        result = await self._post(data)
+        return result["content"][0]["text"]
+
+    async def generate_text(
+        self,
+        system_message: str,
+        prompt: str,
+        max_tokens: int = environment_config.MAX_TOKENS,
+    ) -> str:
+        logger.info(f"Generating text for prompt: {prompt[:50]}...")
+        data = self._prepare_request_data(
+            prompt, system_message=system_message, max_tokens=max_tokens
+        )
+
+        result = await self._post(data, "generate_text")
+        content = result["content"][0]["text"]
+        logger.info(f"Text generation completed")
+        return content
 
     def _get_headers(self) -> Dict[str, str]:
         return {
@@ -68,8 +87,10 @@ class ClaudeAPIClient(BaseAPIClient):
             logger.error(
                 f"API request failed with status {response.status}: {error_detail}"
             )
-            raise Exception(
-                f"API request failed with status {response.status}: {error_detail}"
+            raise APIRequestError(
+                f"API request failed with status {response.status}: {error_detail}",
+                status=response.status,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
             )
 
     def _extract_score(self, result: Dict[str, Any]) -> float:
@@ -80,3 +101,7 @@ class ClaudeAPIClient(BaseAPIClient):
         except (KeyError, ValueError) as e:
             logger.error(f"Failed to extract score from API response: {str(e)}")
             raise Exception(f"Failed to extract score from API response: {str(e)}")
+
+    def _extract_usage(self, result: Dict[str, Any]) -> Tuple[int, int]:
+        usage = result.get("usage") or {}
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
@@ -0,0 +1,62 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Coroutine
+
+from utils.logger import logger
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent successful call latencies, in seconds.
+    """
+
+    def __init__(self, size: int, min_samples: int):
+        self.samples: deque = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        Returns the given latency percentile, or None until enough samples exist.
+        """
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+async def run_hedged(
+    make_call: Callable[[], Coroutine],
+    make_hedge: Callable[[], Coroutine],
+    hedge_after: float,
+    name: str = "",
+) -> Any:
+    """
+    Runs make_call() and, if it has not finished after hedge_after seconds,
+    starts make_hedge() as a duplicate. Returns whichever succeeds first and
+    cancels the other. An error is only raised once both calls have failed.
+    """
+    primary = asyncio.ensure_future(make_call())
+    pending = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.debug(f"{name} call still pending after {hedge_after:.2f}s, hedging")
+        pending.add(asyncio.ensure_future(make_hedge()))
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        # Both calls failed; surface the primary's error
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
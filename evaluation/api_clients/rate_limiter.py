@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Dict
+
+from config import api_config
+from utils.logger import logger
+
+
+class TokenBucketRateLimiter:
+    """
+    Paces requests to a provider within requests-per-minute and
+    tokens-per-minute budgets. Callers queue in arrival order and wait for
+    capacity instead of failing. A budget of None is not enforced.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = requests_per_minute or 0.0
+        self.available_tokens = tokens_per_minute or 0.0
+        self.updated_at = time.monotonic()
+        # asyncio.Lock wakes waiters in FIFO order, which keeps the queue fair
+        self._lock = asyncio.Lock()
+        logger.info(
+            f"Rate limiter for {name}: {requests_per_minute} RPM, {tokens_per_minute} TPM"
+        )
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self.updated_at) / 60
+        self.updated_at = now
+        if self.requests_per_minute:
+            self.available_requests = min(
+                self.requests_per_minute,
+                self.available_requests + elapsed_minutes * self.requests_per_minute,
+            )
+        if self.tokens_per_minute:
+            self.available_tokens = min(
+                self.tokens_per_minute,
+                self.available_tokens + elapsed_minutes * self.tokens_per_minute,
+            )
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests_per_minute and self.available_requests < 1:
+            wait = max(
+                wait, (1 - self.available_requests) * 60 / self.requests_per_minute
+            )
+        if self.tokens_per_minute and self.available_tokens < tokens:
+            wait = max(
+                wait, (tokens - self.available_tokens) * 60 / self.tokens_per_minute
+            )
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        if self.tokens_per_minute:
+            # A request larger than the whole budget would otherwise never run
+            tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                logger.debug(f"Rate limiter for {self.name} waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
+
+            if self.requests_per_minute:
+                self.available_requests -= 1
+            if self.tokens_per_minute:
+                self.available_tokens -= tokens
+
+
+_rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(provider: str) -> TokenBucketRateLimiter:
+    """
+    Returns the limiter shared by every client of ``provider``.
+    """
+    if provider not in _rate_limiters:
+        limits = api_config.RATE_LIMITS.get(provider, {})
+        _rate_limiters[provider] = TokenBucketRateLimiter(
+            provider,
+            limits.get("requests_per_minute"),
+            limits.get("tokens_per_minute"),
+        )
+    return _rate_limiters[provider]
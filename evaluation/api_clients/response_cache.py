@@ -0,0 +1,121 @@
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator
+
+from utils.logger import logger
+
+_bypassed: ContextVar[bool] = ContextVar("response_cache_bypassed", default=False)
+
+
+@contextmanager
+def bypass_response_cache() -> Iterator[None]:
+    """
+    Skips the response cache for requests made inside the block, so callers
+    that opt out of caching always get fresh responses.
+    """
+    token = _bypassed.set(True)
+    try:
+        yield
+    finally:
+        _bypassed.reset(token)
+
+
+def response_cache_bypassed() -> bool:
+    return _bypassed.get()
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of raw API responses.
+
+    Each response is stored as ``<key>.json`` in ``cache_dir``, where the key
+    is the hash of the exact request. Once the directory grows past
+    ``max_bytes`` the least recently used files are removed; a hit refreshes
+    the file's mtime so it survives eviction longer. The directory is created
+    and scanned on the first store, not when the cache is constructed.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Bytes on disk, counted on the first store
+        self.total_bytes: int | None = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                response = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cached response {path}: {e}")
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return response
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            if self.total_bytes is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self.total_bytes = sum(size for _, size, _ in self._entries())
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(response, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self.total_bytes += os.path.getsize(path) - previous
+        except OSError as e:
+            logger.warning(f"Could not store cached response {path}: {e}")
+            return
+
+        if self.max_bytes is not None and self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _remove(self, path: str) -> int:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        if self.total_bytes is not None:
+            self.total_bytes -= size
+        return size
+
+    def _evict(self) -> None:
+        # Rescan so files written by other clients sharing the directory count
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)
+
+        removed = 0
+        for path, _, _ in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            removed += 1
+        logger.info(
+            f"Evicted {removed} cached responses from {self.cache_dir} "
+            f"({self.total_bytes} bytes remain)"
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entries())
@@ -0,0 +1,92 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+
+from config import api_config
+from utils.logger import logger
+from utils.metrics import metrics
+
+from .api_errors import APIRequestError
+
+T = TypeVar("T")
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retries transient API failures with exponential backoff and full jitter,
+    honouring Retry-After, up to ``max_retries`` retries and ``max_total_time``
+    seconds per call. Fatal errors are raised immediately.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_retries: int = api_config.MAX_RETRIES,
+        base_delay: float = api_config.RETRY_DELAY,
+        max_delay: float = api_config.RETRY_MAX_DELAY,
+        max_total_time: float = api_config.RETRY_MAX_TOTAL_TIME,
+    ):
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_time = max_total_time
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        if isinstance(error, APIRequestError):
+            return error.retryable
+        return isinstance(error, asyncio.TimeoutError)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_total_time)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def run(self, operation: Callable[[], Awaitable[T]]) -> T:
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await operation()
+            except Exception as e:
+                if not self.is_retryable(e):
+                    metrics.increment(f"{self.name}.fatal_errors")
+                    raise
+
+                delay = self.backoff(attempt, e)
+                elapsed = time.monotonic() - started_at
+                if attempt >= self.max_retries or elapsed + delay > self.max_total_time:
+                    metrics.increment(f"{self.name}.retries_exhausted")
+                    logger.error(
+                        f"{self.name} request failed after {attempt + 1} attempts: {str(e) or type(e).__name__}"
+                    )
+                    raise
+
+                attempt += 1
+                metrics.increment(f"{self.name}.retries")
+                logger.warning(
+                    f"{self.name} request failed ({str(e) or type(e).__name__}); retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
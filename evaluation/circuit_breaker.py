@@ -0,0 +1,122 @@
+import time
+from collections import deque
+
+from config import evaluation_config
+from utils.logger import logger
+from utils.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one model from the outcomes of its recent requests.
+
+    The model's API client records every request: its provider latency on
+    success, or a failure for network errors, timeouts, 429s and 5xxs. Time
+    spent queued locally is not counted. The breaker opens when too many of
+    the last ``window_size`` outcomes failed or were slower than
+    ``slow_call_seconds``. While open, no evaluations are allowed. After
+    ``open_seconds`` it turns half-open and lets up to ``half_open_calls``
+    probe evaluations through. If ``half_open_calls`` requests succeed the
+    breaker closes again; any failed request reopens it.
+
+    Every evaluation admitted by allow_request() must call release() once it
+    finishes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = evaluation_config.CIRCUIT_BREAKER_WINDOW,
+        min_calls: int = evaluation_config.CIRCUIT_BREAKER_MIN_CALLS,
+        failure_rate: float = evaluation_config.CIRCUIT_BREAKER_FAILURE_RATE,
+        slow_call_seconds: float = evaluation_config.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = evaluation_config.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = evaluation_config.CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_calls: int = evaluation_config.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        # (failed, slow) flags of the most recent outcomes
+        self.outcomes: deque = deque(maxlen=window_size)
+        self._state = CLOSED
+        self.opened_at = 0.0
+        self.probes_admitted = 0
+        self.probes_succeeded = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self.probes_admitted < self.half_open_calls:
+            self.probes_admitted += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """
+        Frees the probe slot of an admitted evaluation once it has finished.
+        """
+        if self._state == HALF_OPEN and self.probes_admitted > 0:
+            self.probes_admitted -= 1
+
+    def record_success(self, latency: float) -> None:
+        slow = latency > self.slow_call_seconds
+        if self._state == HALF_OPEN:
+            if slow:
+                self._transition(OPEN)
+                return
+            self.probes_succeeded += 1
+            if self.probes_succeeded >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+
+        self.outcomes.append((False, slow))
+        self._check_thresholds()
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+
+        self.outcomes.append((True, False))
+        self._check_thresholds()
+
+    def _check_thresholds(self) -> None:
+        if self._state != CLOSED or len(self.outcomes) < self.min_calls:
+            return
+
+        failures = sum(failed for failed, _ in self.outcomes) / len(self.outcomes)
+        slow_calls = sum(slow for _, slow in self.outcomes) / len(self.outcomes)
+        if failures >= self.failure_rate or slow_calls >= self.slow_call_rate:
+            logger.warning(
+                f"Circuit for {self.name} opening: failure rate {failures:.0%}, "
+                f"slow call rate {slow_calls:.0%}"
+            )
+            self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        logger.info(f"Circuit for {self.name}: {self._state} -> {state}")
+        self._state = state
+        self.probes_admitted = 0
+        self.probes_succeeded = 0
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            metrics.increment(f"{self.name}.circuit_opened")
+        elif state == CLOSED:
+            self.outcomes.clear()
+        metrics.set_gauge(f"{self.name}.circuit_state", [CLOSED, HALF_OPEN, OPEN].index(state))
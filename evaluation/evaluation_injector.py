@@ -16,7 +16,9 @@ class EvaluationInjector:
 
         ModelInjector.inject_models(model_factory)
 
-        evaluation_service = EvaluationService(model_factory)
+        evaluation_service = EvaluationService(
+            model_factory, registry.get("memoization_service")
+        )
         score_aggregator_service = ScoreAggregatorService()
 
         registry.register("evaluation_service", evaluation_service)
@@ -2,14 +2,21 @@ from typing import Any, Dict
 
 from utils.logger import log_execution_time, logger
 
+from .circuit_breaker import CircuitBreaker
+
 
 class ModelFactory:
     def __init__(self):
         self.models: Dict[str, Any] = {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         logger.debug("ModelFactory initialized")
 
     def register_model(self, name: str, model: Any):
         self.models[name] = model
+        self.circuit_breakers[name] = CircuitBreaker(name)
+        api_client = getattr(model, "api_client", None)
+        if api_client is not None:
+            api_client.circuit_breaker = self.circuit_breakers[name]
         logger.debug(f"Registered model: {name}")
 
     def get_model(self, name: str) -> Any:
@@ -25,7 +32,27 @@ class ModelFactory:
         logger.debug("Retrieving all models")
         return self.models
 
+    def get_circuit_breaker(self, name: str) -> CircuitBreaker:
+        return self.circuit_breakers[name]
+
+    def get_model_health(self) -> Dict[str, str]:
+        return {name: breaker.state for name, breaker in self.circuit_breakers.items()}
+
     def model_exists(self, name: str) -> bool:
         exists = name in self.models
         logger.debug(f"Checked if model {name} exists: {exists}")
         return exists
+
+    async def start_clients(self) -> None:
+        for model in self.models.values():
+            api_client = getattr(model, "api_client", None)
+            if api_client is not None:
+                await api_client.start()
+        logger.debug("Model API clients started")
+
+    async def close_clients(self) -> None:
+        for model in self.models.values():
+            api_client = getattr(model, "api_client", None)
+            if api_client is not None:
+                await api_client.close()
+        logger.debug("Model API clients closed")
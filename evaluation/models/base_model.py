@@ -1,9 +1,30 @@
+import hashlib
 from abc import ABC, abstractmethod
+from numbers import Number
+from typing import Dict, List
 
-from utils.logger import log_execution_time
+from config import evaluation_config
+from utils.async_utils import run_async_tasks
+from utils.json_utils import parse_json_reply
+from utils.logger import log_execution_time, logger
 
 
 class BaseLLMModel(ABC):
+    multi_criteria_system_message = (
+        f"You are an AI assistant tasked with evaluating the given argument in terms of the criteria given. "
+        f"You must be an unbiased judge to the argument provided. "
+        f"Respond with only a JSON object whose keys are exactly the criteria names "
+        f"and whose values are floats between 0 and 1, and nothing else. "
+    )
+
+    @staticmethod
+    def multi_criteria_prompt(argument: str) -> str:
+        return (
+            f"Evaluate the following argument on each of these criteria: "
+            f"{', '.join(evaluation_config.CRITERIA)}. Score each criterion on a "
+            f"decimal scale of 0 to 1.00: '{argument}'"
+        )
+
     @abstractmethod
     @log_execution_time
     async def evaluate_coherence(self, argument: str) -> float:
@@ -23,3 +44,61 @@ class BaseLLMModel(ABC):
     @log_execution_time
     async def evaluate_factual_accuracy(self, argument: str) -> float:
         pass
+
+    def prompt_fingerprint(self, evaluation_type: str, single_call: bool = False) -> str:
+        """
+        Hashes everything besides the argument that determines a score: the API
+        model, the system message and the prompt template for the criterion.
+        """
+        if single_call:
+            template = self.multi_criteria_prompt("{argument}")
+            system_message = self.multi_criteria_system_message
+        else:
+            template = self.evaluation_prompts[evaluation_type]("{argument}")
+            system_message = self.eval_system_message
+        content = "\n".join(
+            [self.api_client.model, system_message, evaluation_type, template]
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _parse_criteria_scores(content: str, criteria: List[str]) -> Dict[str, float]:
+        scores = parse_json_reply(content)
+        if not isinstance(scores, dict) or set(scores) != set(criteria):
+            raise ValueError(f"Expected a JSON object with keys {criteria}")
+        for criterion, score in scores.items():
+            if isinstance(score, bool) or not isinstance(score, Number):
+                raise ValueError(f"Score for {criterion} is not a number: {score}")
+            if not 0 <= score <= 1:
+                raise ValueError(f"Score for {criterion} is outside 0 to 1: {score}")
+        return {criterion: float(scores[criterion]) for criterion in criteria}
+
+    @log_execution_time
+    async def evaluate_all(self, argument: str, fallback: bool = True) -> Dict[str, float]:
+        """
+        Scores every criterion with a single request. When the reply is not the
+        expected JSON object, falls back to one request per criterion, or
+        raises ValueError if ``fallback`` is False so the caller can schedule
+        those requests itself.
+        """
+        criteria = evaluation_config.CRITERIA
+        # Sent as an evaluation, so it gets the evaluation deadline, coalescing
+        # and response caching rather than those of argument generation
+        content = await self.api_client.evaluate_text(
+            self.multi_criteria_system_message,
+            self.multi_criteria_prompt(argument),
+            evaluation_config.MULTI_CRITERIA_MAX_TOKENS,
+        )
+        try:
+            return self._parse_criteria_scores(content, criteria)
+        except ValueError as e:
+            if not fallback:
+                raise
+            logger.warning(
+                f"Falling back to per-criterion evaluation for {type(self).__name__}: {str(e)}"
+            )
+
+        scores = await run_async_tasks(
+            [self._evaluate(criterion, argument) for criterion in criteria]
+        )
+        return dict(zip(criteria, scores))
@@ -1,5 +1,6 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, List
 
+from config import environment_config
 from evaluation.api_clients.chatgpt_api_client import ChatGPTAPIClient
 from utils.logger import log_execution_time, logger
 
@@ -51,5 +52,23 @@ class ChatGPTModel(BaseLLMModel):
     async def evaluate_factual_accuracy(self, argument: str) -> float:
         return await self._evaluate("factual_accuracy", argument)
 
-    async def generate_text(self, system_message: str, user_message: str) -> str:
-        return await self.api_client.generate_text(system_message, user_message)
+    async def generate_text(
+        self,
+        system_message: str,
+        user_message: str,
+        max_tokens: int = environment_config.MAX_TOKENS,
+    ) -> str:
+        return await self.api_client.generate_text(
+            system_message, user_message, max_tokens
+        )
+
+    async def generate_texts(
+        self,
+        system_message: str,
+        user_message: str,
+        n: int,
+        max_tokens: int = environment_config.MAX_TOKENS,
+    ) -> List[str]:
+        return await self.api_client.generate_texts(
+            system_message, user_message, n, max_tokens
+        )
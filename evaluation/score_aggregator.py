@@ -13,6 +13,8 @@ class ScoreAggregator:
         aggregated_scores = {}
         for result in evaluation_results:
             for model, scores in result.items():
+                if scores is None:
+                    continue
                 if model not in aggregated_scores:
                     aggregated_scores[model] = {k: [] for k in scores.keys()}
                 for criterion, score in scores.items():
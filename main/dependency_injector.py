@@ -1,10 +1,12 @@
 from commands.command_injector import CommandInjector
+from config import api_config
 from debate_traversal.traversal_injector import TraversalInjector
 from evaluation.evaluation_injector import EvaluationInjector
 from services.argument_generation_injector import ArgumentGenerationInjector
 from services.services_injector import ServicesInjector
 from utils.dependency_registry import dependency_registry
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import usage_meter
 from visualization.visualization_injector import VisualizationInjector
 
 
@@ -43,6 +45,17 @@ class DependencyInjector:
 
         logger.info("Dependencies initialized successfully")
 
+    async def startup(self):
+        await self.registry.get("model_factory").start_clients()
+        logger.info("Application startup completed")
+
+    async def shutdown(self):
+        await self.registry.get("model_factory").close_clients()
+        # Flush any buffered cache writes (e.g. compact the cache journal)
+        self.registry.get("cache_manager").close()
+        usage_meter.export(api_config.USAGE_REPORT_PATH)
+        logger.info("Application shutdown completed")
+
     def clear_dependencies(self):
         self.registry.clear()
         logger.debug("Dependencies cleared")
@@ -29,7 +29,11 @@ async def main():
     controller = Controller(injector, quit_event)
 
     # Start the application
-    await asyncio.gather(controller.start(), renderer.start(quit_event))
+    await injector.startup()
+    try:
+        await asyncio.gather(controller.start(), renderer.start(quit_event))
+    finally:
+        await injector.shutdown()
     logger.info("LLM Debate Argument Evaluator finished")
 
 
@@ -1,7 +1,16 @@
 from .cache_manager import CacheManager
+from .embedding_index import EmbeddingIndex
+from .embedding_store import EmbeddingStore
+from .exact_match_index import ExactMatchIndex, normalize_argument
+from .ivf_index import IVFIndex
 from .semantic_similarity import SemanticSimilarity
 
 __all__ = [
     "CacheManager",
+    "EmbeddingIndex",
+    "EmbeddingStore",
+    "ExactMatchIndex",
+    "IVFIndex",
     "SemanticSimilarity",
+    "normalize_argument",
 ]
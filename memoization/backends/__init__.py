@@ -0,0 +1,13 @@
+from .base_cache_backend import BaseCacheBackend
+from .journal_cache_backend import JournalCacheBackend
+from .json_cache_backend import JsonCacheBackend
+from .shared_cache_backend import SharedCacheBackend
+from .sqlite_cache_backend import SqliteCacheBackend
+
+__all__ = [
+    "BaseCacheBackend",
+    "JournalCacheBackend",
+    "JsonCacheBackend",
+    "SharedCacheBackend",
+    "SqliteCacheBackend",
+]
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class BaseCacheBackend(ABC):
+    # Set by SharedCacheBackend, whose sharers enforce limits from storage
+    shares_eviction_state = False
+
+    @abstractmethod
+    def get(self, key: str) -> Dict[str, Any] | None:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def delete_many(self, keys: List[str]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def stored_times(self) -> Dict[str, float]:
+        """
+        Returns when each entry was stored, for backends that persist it.
+        """
+        return {}
+
+    def close(self) -> None:
+        pass
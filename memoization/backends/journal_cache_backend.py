@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Tuple
+
+from utils.logger import log_execution_time, logger
+
+from .base_cache_backend import BaseCacheBackend
+
+
+class JournalCacheBackend(BaseCacheBackend):
+    """
+    Appends one JSONL record per store to ``<cache_file>.journal`` and rebuilds
+    the in-memory map by replaying it over the JSON snapshot at load time.
+    The snapshot uses the same format as JsonCacheBackend, so existing cache
+    files are picked up unchanged.
+    """
+
+    def __init__(self, cache_file: str, compaction_interval: int = 1000):
+        self.cache_file = cache_file
+        self.journal_file = f"{cache_file}.journal"
+        self.compaction_interval = compaction_interval
+        self.journal_records = 0
+        self.torn_journal = False
+        self.cache: Dict[str, Any] = self._load_cache()
+        if self.torn_journal:
+            # Later appends would land behind the torn record and be lost on replay
+            self.compact()
+
+    @log_execution_time
+    def _load_cache(self) -> Dict[str, Any]:
+        cache: Dict[str, Any] = {}
+        try:
+            with open(self.cache_file, "r") as f:
+                cache = json.load(f)
+            logger.info(f"Cache snapshot loaded from {self.cache_file}")
+        except FileNotFoundError:
+            logger.warning(
+                f"Cache file {self.cache_file} not found. Creating a new cache."
+            )
+
+        try:
+            with open(self.journal_file, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Only the last record can be torn by a crash mid-append
+                        logger.warning(f"Ignoring torn record in {self.journal_file}")
+                        self.torn_journal = True
+                        break
+                    self._apply(cache, record)
+                    self.journal_records += 1
+            logger.info(
+                f"Replayed {self.journal_records} journal records from {self.journal_file}"
+            )
+        except FileNotFoundError:
+            pass
+
+        return cache
+
+    @staticmethod
+    def _apply(cache: Dict[str, Any], record: Dict[str, Any]) -> None:
+        if record["op"] == "put":
+            cache[record["key"]] = record["value"]
+        elif record["op"] == "delete":
+            cache.pop(record["key"], None)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.journal_file) or ".", exist_ok=True)
+        with open(self.journal_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_records += 1
+
+        if self.compaction_interval and self.journal_records >= self.compaction_interval:
+            self.compact()
+
+    @log_execution_time
+    def compact(self) -> None:
+        """
+        Writes a fresh snapshot atomically, then truncates the journal.
+        Replaying a journal over a snapshot that already contains it is harmless,
+        so a crash between the two steps loses nothing.
+        """
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(self.cache, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.cache_file)
+
+        with open(self.journal_file, "w"):
+            pass
+        self.journal_records = 0
+        self.torn_journal = False
+        logger.info(f"Cache journal compacted into {self.cache_file}")
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        return self.cache.get(key)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.cache[key] = value
+        self._append({"op": "put", "key": key, "value": value})
+
+    def delete(self, key: str) -> None:
+        if self.cache.pop(key, None) is not None:
+            self._append({"op": "delete", "key": key})
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(list(self.cache.items()))
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def close(self) -> None:
+        if self.journal_records:
+            self.compact()
@@ -0,0 +1,59 @@
+import json
+import os
+from typing import Any, Dict, Iterator, List, Tuple
+
+from utils.logger import log_execution_time, logger
+
+from .base_cache_backend import BaseCacheBackend
+
+
+class JsonCacheBackend(BaseCacheBackend):
+    """
+    Keeps the whole cache in memory and rewrites the JSON file on every store.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self.cache: Dict[str, Any] = self._load_cache()
+
+    @log_execution_time
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, "r") as f:
+                cache = json.load(f)
+            logger.info(f"Cache loaded from {self.cache_file}")
+            return cache
+        except FileNotFoundError:
+            logger.warning(
+                f"Cache file {self.cache_file} not found. Creating a new cache."
+            )
+            return {}
+
+    @log_execution_time
+    def _save_cache(self) -> None:
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        with open(self.cache_file, "w") as f:
+            json.dump(self.cache, f)
+        logger.info(f"Cache saved to {self.cache_file}")
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        return self.cache.get(key)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.cache[key] = value
+        self._save_cache()
+
+    def delete(self, key: str) -> None:
+        if self.cache.pop(key, None) is not None:
+            self._save_cache()
+
+    def delete_many(self, keys: List[str]) -> None:
+        removed = [self.cache.pop(key, None) for key in keys]
+        if any(evaluation is not None for evaluation in removed):
+            self._save_cache()
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(list(self.cache.items()))
+
+    def __len__(self) -> int:
+        return len(self.cache)
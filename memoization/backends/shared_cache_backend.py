@@ -0,0 +1,44 @@
+from abc import abstractmethod
+from typing import List, Tuple
+
+from .base_cache_backend import BaseCacheBackend
+
+
+class SharedCacheBackend(BaseCacheBackend):
+    """
+    A backend shared between processes. Entry sizes, store times and access
+    times are kept in storage, so every sharer enforces the same limits.
+    """
+
+    shares_eviction_state = True
+
+    @abstractmethod
+    def touch(self, key: str) -> None:
+        """
+        Marks an entry as just used.
+        """
+
+    @abstractmethod
+    def stored_since(self, since: float) -> List[str]:
+        """
+        Returns the entries stored, by any sharer, after ``since``.
+        """
+
+    @abstractmethod
+    def usage(self) -> Tuple[int, int]:
+        """
+        Returns the entry count and their total size in bytes.
+        """
+
+    @abstractmethod
+    def eviction_candidates(
+        self,
+        ttl_seconds: float | None,
+        max_entries: int | None,
+        max_bytes: int | None,
+        eviction_policy: str,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Returns the expired entries and, after those, the entries to evict to
+        get back within the limits.
+        """
@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from utils.logger import log_execution_time, logger
+
+from .shared_cache_backend import SharedCacheBackend
+
+
+class SqliteCacheBackend(SharedCacheBackend):
+    """
+    Stores evaluations in a SQLite database in WAL mode so several evaluator
+    processes can read and write one shared cache. Every store is committed
+    immediately, so other processes see it at once and a crash loses nothing.
+
+    Entry sizes, store times and access times live in the database too, so
+    every process sharing the cache enforces the same eviction limits.
+    """
+
+    def __init__(
+        self,
+        database_file: str,
+        busy_timeout: float = 30.0,
+        legacy_cache_file: str | None = None,
+    ):
+        self.database_file = database_file
+
+        os.makedirs(os.path.dirname(database_file) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(
+            database_file, timeout=busy_timeout, check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "argument TEXT PRIMARY KEY, "
+                "evaluation TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, "
+                "size INTEGER NOT NULL DEFAULT 0, "
+                "accessed_at REAL NOT NULL DEFAULT 0)"
+            )
+            self._add_eviction_columns()
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS evaluations_stored_at "
+                "ON evaluations (stored_at)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS evaluations_accessed_at "
+                "ON evaluations (accessed_at)"
+            )
+        logger.info(f"SQLite cache opened at {database_file}")
+
+        if legacy_cache_file:
+            self._import_legacy_cache(legacy_cache_file)
+
+    def _add_eviction_columns(self) -> None:
+        # Databases created before eviction state was persisted lack the columns
+        columns = {
+            row[1] for row in self.connection.execute("PRAGMA table_info(evaluations)")
+        }
+        if "size" in columns:
+            return
+        self.connection.execute(
+            "ALTER TABLE evaluations ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+        )
+        self.connection.execute(
+            "ALTER TABLE evaluations ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+        )
+        self.connection.execute(
+            "UPDATE evaluations SET "
+            "size = length(CAST(argument AS BLOB)) + length(evaluation), "
+            "accessed_at = stored_at"
+        )
+        logger.info(f"Added eviction columns to {self.database_file}")
+
+    @staticmethod
+    def _row(argument: str, evaluation: Dict[str, Any], now: float) -> Tuple:
+        encoded = json.dumps(evaluation)
+        size = len(argument.encode("utf-8")) + len(encoded)
+        return argument, encoded, now, size, now
+
+    @log_execution_time
+    def _import_legacy_cache(self, legacy_cache_file: str) -> None:
+        if len(self) or not os.path.exists(legacy_cache_file):
+            return
+
+        with open(legacy_cache_file, "r") as f:
+            legacy_cache = json.load(f)
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO evaluations "
+                "(argument, evaluation, stored_at, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    self._row(argument, evaluation, now)
+                    for argument, evaluation in legacy_cache.items()
+                ),
+            )
+        logger.info(
+            f"Imported {len(legacy_cache)} cached evaluations from {legacy_cache_file}"
+        )
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        row = self.connection.execute(
+            "SELECT evaluation FROM evaluations WHERE argument = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        # WAL makes a commit per store cheap enough to skip buffering
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO evaluations "
+                "(argument, evaluation, stored_at, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._row(key, value, time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM evaluations WHERE argument = ?", (key,))
+
+    def delete_many(self, keys: List[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM evaluations WHERE argument = ?", ((key,) for key in keys)
+            )
+
+    def touch(self, key: str) -> None:
+        with self.connection:
+            self.connection.execute(
+                "UPDATE evaluations SET accessed_at = ? WHERE argument = ?",
+                (time.time(), key),
+            )
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        cursor = self.connection.execute("SELECT argument, evaluation FROM evaluations")
+        try:
+            for argument, evaluation in cursor:
+                yield argument, json.loads(evaluation)
+        finally:
+            cursor.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def stored_times(self) -> Dict[str, float]:
+        return dict(
+            self.connection.execute("SELECT argument, stored_at FROM evaluations")
+        )
+
+    def stored_since(self, since: float) -> List[str]:
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT argument FROM evaluations WHERE stored_at > ?", (since,)
+            )
+        ]
+
+    def usage(self) -> Tuple[int, int]:
+        entries, size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations"
+        ).fetchone()
+        return entries, size
+
+    def eviction_candidates(
+        self,
+        ttl_seconds: float | None,
+        max_entries: int | None,
+        max_bytes: int | None,
+        eviction_policy: str,
+    ) -> Tuple[List[str], List[str]]:
+        expired: List[str] = []
+        expired_size = 0
+        if ttl_seconds is not None:
+            for argument, entry_size in self.connection.execute(
+                "SELECT argument, size FROM evaluations WHERE stored_at < ? "
+                "ORDER BY stored_at",
+                (time.time() - ttl_seconds,),
+            ):
+                expired.append(argument)
+                expired_size += entry_size
+        if max_entries is None and max_bytes is None:
+            return expired, []
+
+        entries, size = self.usage()
+        entries -= len(expired)
+        size -= expired_size
+
+        def over_limit() -> bool:
+            return (max_entries is not None and entries > max_entries) or (
+                max_bytes is not None and size > max_bytes
+            )
+
+        evicted: List[str] = []
+        if not over_limit():
+            return expired, evicted
+
+        order = "accessed_at" if eviction_policy == "lru" else "stored_at"
+        skip = set(expired)
+        cursor = self.connection.execute(
+            f"SELECT argument, size FROM evaluations ORDER BY {order}"
+        )
+        try:
+            for argument, entry_size in cursor:
+                if not over_limit():
+                    break
+                if argument in skip:
+                    continue
+                evicted.append(argument)
+                entries -= 1
+                size -= entry_size
+        finally:
+            cursor.close()
+        return expired, evicted
+
+    def close(self) -> None:
+        self.connection.close()
+        logger.info(f"SQLite cache closed at {self.database_file}")
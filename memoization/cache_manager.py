@@ -1,44 +1,213 @@
 import json
-from typing import Any, Dict
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List
 
+from config import memoization_config
 from utils.logger import log_execution_time, logger
 
+from .backends.base_cache_backend import BaseCacheBackend
+from .backends.journal_cache_backend import JournalCacheBackend
+from .backends.json_cache_backend import JsonCacheBackend
+from .backends.sqlite_cache_backend import SqliteCacheBackend
+
 
 class CacheManager:
-    def __init__(self, cache_file: str = "argument_cache.json"):
+    def __init__(
+        self,
+        cache_file: str = "argument_cache.json",
+        backend: str = memoization_config.CACHE_BACKEND,
+        max_entries: int | None = memoization_config.CACHE_MAX_ENTRIES,
+        max_bytes: int | None = memoization_config.CACHE_MAX_BYTES,
+        ttl_seconds: float | None = memoization_config.CACHE_TTL_SECONDS,
+        eviction_policy: str = memoization_config.CACHE_EVICTION_POLICY,
+    ):
+        if eviction_policy not in ("lru", "fifo"):
+            logger.error(f"Invalid eviction policy: {eviction_policy}")
+            raise ValueError(f"Invalid eviction policy: {eviction_policy}")
+
         self.cache_file = cache_file
-        self.cache: Dict[str, Any] = self._load_cache()
-        logger.info(f"CacheManager initialized with cache file: {cache_file}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.eviction_policy = eviction_policy
+        self.backend: BaseCacheBackend = self._create_backend(backend)
 
-    @log_execution_time
-    def _load_cache(self) -> Dict[str, Any]:
-        try:
-            with open(self.cache_file, "r") as f:
-                cache = json.load(f)
-            logger.info(f"Cache loaded from {self.cache_file}")
-            return cache
-        except FileNotFoundError:
-            logger.warning(
-                f"Cache file {self.cache_file} not found. Creating a new cache."
+        # Entry sizes in eviction order (least recently used or oldest first)
+        # and store times in insertion order for TTL expiry
+        self.entry_sizes: OrderedDict[str, int] = OrderedDict()
+        self.stored_at: OrderedDict[str, float] = OrderedDict()
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.eviction_listeners: List[Callable[[str], None]] = []
+        self._load_entry_stats()
+
+        logger.info(
+            f"CacheManager initialized with {backend} backend and cache file: {cache_file}"
+        )
+
+    def _create_backend(self, backend: str) -> BaseCacheBackend:
+        if backend == "json":
+            return JsonCacheBackend(self.cache_file)
+        elif backend == "journal":
+            return JournalCacheBackend(
+                self.cache_file, memoization_config.JOURNAL_COMPACTION_INTERVAL
+            )
+        elif backend == "sqlite":
+            return SqliteCacheBackend(
+                memoization_config.SQLITE_CACHE_PATH,
+                legacy_cache_file=self.cache_file,
             )
-            return {}
+        logger.error(f"Invalid cache backend: {backend}")
+        raise ValueError(f"Invalid cache backend: {backend}")
+
+    @staticmethod
+    def _entry_size(argument: str, evaluation: Dict[str, Any]) -> int:
+        return len(argument.encode("utf-8")) + len(json.dumps(evaluation))
 
     @log_execution_time
-    def _save_cache(self) -> None:
-        with open(self.cache_file, "w") as f:
-            json.dump(self.cache, f)
-        logger.info(f"Cache saved to {self.cache_file}")
+    def _load_entry_stats(self) -> None:
+        if self.backend.shares_eviction_state:
+            self._enforce_limits()
+            return
+
+        # Backends that do not persist store times start the TTL clock at load
+        now = time.time()
+        stored_times = self.backend.stored_times()
+        entries = sorted(
+            (
+                (stored_times.get(argument, now), argument, evaluation)
+                for argument, evaluation in self.backend.items()
+            ),
+            key=lambda entry: entry[0],
+        )
+        for stored_at, argument, evaluation in entries:
+            self._track(argument, evaluation, stored_at)
+        self._enforce_limits()
+
+    def _track(
+        self, argument: str, evaluation: Dict[str, Any], stored_at: float
+    ) -> None:
+        self._untrack(argument)
+        size = self._entry_size(argument, evaluation)
+        self.entry_sizes[argument] = size
+        self.stored_at[argument] = stored_at
+        self.resident_bytes += size
+
+    def _untrack(self, argument: str) -> None:
+        size = self.entry_sizes.pop(argument, None)
+        if size is not None:
+            self.resident_bytes -= size
+        self.stored_at.pop(argument, None)
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        self.eviction_listeners.append(listener)
+
+    def _evict(self, arguments: List[str]) -> None:
+        # Deleted in one backend call per pass, so the JSON backend rewrites
+        # its file once however many entries go
+        if not arguments:
+            return
+        self.backend.delete_many(arguments)
+        for argument in arguments:
+            self._untrack(argument)
+            for listener in self.eviction_listeners:
+                listener(argument)
+            logger.debug(f"Evicted cached argument: '{argument[:50]}...'")
+
+    def _is_expired(self, argument: str, now: float) -> bool:
+        stored_at = self.stored_at.get(argument)
+        return (
+            self.ttl_seconds is not None
+            and stored_at is not None
+            and now - stored_at > self.ttl_seconds
+        )
+
+    def _expired_entries(self) -> List[str]:
+        now = time.time()
+        expired = []
+        for argument in self.stored_at:
+            if not self._is_expired(argument, now):
+                break
+            expired.append(argument)
+        return expired
+
+    def _expire(self) -> None:
+        if self.backend.shares_eviction_state:
+            self._enforce_shared_limits(check_size=False)
+            return
+
+        expired = self._expired_entries()
+        self._evict(expired)
+        self.expirations += len(expired)
+
+    def _enforce_shared_limits(self, check_size: bool = True) -> None:
+        # Other processes store and evict too, so limits are checked against
+        # the backend rather than this process's bookkeeping
+        expired, over_limit = self.backend.eviction_candidates(
+            self.ttl_seconds,
+            self.max_entries if check_size else None,
+            self.max_bytes if check_size else None,
+            self.eviction_policy,
+        )
+        self._evict(expired + over_limit)
+        self.expirations += len(expired)
+        self.evictions += len(over_limit)
+
+    def _enforce_limits(self) -> None:
+        if self.backend.shares_eviction_state:
+            self._enforce_shared_limits()
+            return
+
+        expired = self._expired_entries()
+        entries = len(self.entry_sizes) - len(expired)
+        resident_bytes = self.resident_bytes - sum(
+            self.entry_sizes[argument] for argument in expired
+        )
+        skip = set(expired)
+        over_limit = []
+        for argument, size in self.entry_sizes.items():
+            if not (
+                (self.max_entries is not None and entries > self.max_entries)
+                or (self.max_bytes is not None and resident_bytes > self.max_bytes)
+            ):
+                break
+            if argument in skip:
+                continue
+            over_limit.append(argument)
+            entries -= 1
+            resident_bytes -= size
+
+        self._evict(expired + over_limit)
+        self.expirations += len(expired)
+        self.evictions += len(over_limit)
 
     @log_execution_time
     def store(self, argument: str, evaluation: Dict[str, Any]) -> None:
-        self.cache[argument] = evaluation
-        self._save_cache()
+        self.backend.put(argument, evaluation)
+        if not self.backend.shares_eviction_state:
+            self._track(argument, evaluation, time.time())
+        self._enforce_limits()
         logger.debug(f"Stored evaluation for argument: '{argument[:50]}...'")
 
     @log_execution_time
     def retrieve(self, argument: str) -> Dict[str, Any] | None:
-        evaluation = self.cache.get(argument)
+        if self.backend.shares_eviction_state:
+            self._expire()
+        if self._is_expired(argument, time.time()):
+            self._evict([argument])
+            self.expirations += 1
+            evaluation = None
+        else:
+            evaluation = self.backend.get(argument)
+
         if evaluation:
+            if self.eviction_policy == "lru":
+                if self.backend.shares_eviction_state:
+                    self.backend.touch(argument)
+                elif argument in self.entry_sizes:
+                    self.entry_sizes.move_to_end(argument)
             logger.debug(f"Retrieved evaluation for argument: '{argument[:50]}...'")
         else:
             logger.debug(
@@ -47,6 +216,34 @@ class CacheManager:
         return evaluation
 
     @log_execution_time
-    def get_all_arguments(self) -> Dict[str, Any]:
-        logger.debug(f"Retrieving all {len(self.cache)} cached arguments")
-        return self.cache
+    def get_all_arguments(self) -> Iterator[str]:
+        self._expire()
+        logger.debug(f"Retrieving all {len(self.backend)} cached arguments")
+        return (argument for argument, _ in self.backend.items())
+
+    def arguments_stored_since(self, since: float) -> List[str]:
+        """
+        Returns the arguments stored after ``since`` by any process sharing
+        the backend. Unshared backends only change through this manager, so
+        there is nothing to report.
+        """
+        if not self.backend.shares_eviction_state:
+            return []
+        self._expire()
+        return self.backend.stored_since(since)
+
+    def stats(self) -> Dict[str, int]:
+        if self.backend.shares_eviction_state:
+            entries, resident_bytes = self.backend.usage()
+        else:
+            entries, resident_bytes = len(self.entry_sizes), self.resident_bytes
+        return {
+            "entries": entries,
+            "resident_bytes": resident_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self) -> None:
+        self.backend.close()
+        logger.debug(f"CacheManager closed with stats: {self.stats()}")
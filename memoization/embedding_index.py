@@ -0,0 +1,139 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.logger import log_execution_time, logger
+
+from .ivf_index import IVFIndex
+
+
+class EmbeddingIndex:
+    """
+    In-memory index holding one L2-normalized embedding row per cached argument.
+    Lookups are a single matrix-vector product followed by an argmax.
+
+    With an ``ann_index``, searches over at least ``ann_min_entries`` rows only
+    score the rows in the probed IVF lists. Candidate scores are still exact
+    cosine similarities, so callers can apply the same threshold either way.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 256,
+        ann_index: IVFIndex | None = None,
+        ann_min_entries: int = 10000,
+        ann_index_path: str | None = None,
+        ann_retrain_factor: float = 4.0,
+    ):
+        self.arguments: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.matrix: np.ndarray | None = None
+        self.initial_capacity = initial_capacity
+        self.ann_index = ann_index
+        self.ann_min_entries = ann_min_entries
+        self.ann_index_path = ann_index_path
+        self.ann_retrain_factor = ann_retrain_factor
+        logger.info("EmbeddingIndex initialized")
+
+    def __len__(self) -> int:
+        return len(self.arguments)
+
+    def __contains__(self, argument: str) -> bool:
+        return argument in self.positions
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _ensure_capacity(self, dimension: int) -> None:
+        if self.matrix is None:
+            self.matrix = np.zeros(
+                (self.initial_capacity, dimension), dtype=np.float32
+            )
+        elif self.matrix.shape[1] != dimension:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match index dimension {self.matrix.shape[1]}"
+            )
+        elif len(self.arguments) >= self.matrix.shape[0]:
+            # Grow geometrically so that appends stay amortized O(1)
+            grown = np.zeros(
+                (self.matrix.shape[0] * 2, dimension), dtype=np.float32
+            )
+            grown[: len(self.arguments)] = self.matrix[: len(self.arguments)]
+            self.matrix = grown
+
+    def add(self, argument: str, embedding: np.ndarray) -> None:
+        vector = self._normalize(embedding)
+        position = self.positions.get(argument)
+        if position is None:
+            self._ensure_capacity(vector.shape[0])
+            position = len(self.arguments)
+            self.arguments.append(argument)
+            self.positions[argument] = position
+            logger.debug(f"Indexed argument {position}: '{argument[:50]}...'")
+
+        self.matrix[position] = vector
+        if self.ann_index is not None and self.ann_index.is_trained:
+            self.ann_index.add(position, vector)
+
+    def remove(self, argument: str) -> None:
+        position = self.positions.pop(argument, None)
+        if position is None:
+            return
+
+        # Move the last row into the freed slot to keep the matrix dense
+        last = len(self.arguments) - 1
+        if position != last:
+            moved = self.arguments[last]
+            self.matrix[position] = self.matrix[last]
+            self.arguments[position] = moved
+            self.positions[moved] = position
+            if self.ann_index is not None and self.ann_index.is_trained:
+                self.ann_index.move(last, position)
+        self.arguments.pop()
+        logger.debug(f"Removed argument from index: '{argument[:50]}...'")
+
+    def load_ann(self) -> None:
+        """
+        Restores previously trained IVF centroids and assigns the current rows.
+        """
+        if self.ann_index is None or self.ann_index_path is None or not self.arguments:
+            return
+        if self.ann_index.load(self.ann_index_path, self.matrix.shape[1]):
+            self.ann_index.assign_all(self.matrix[: len(self.arguments)])
+
+    def _maybe_train_ann(self) -> None:
+        size = len(self.arguments)
+        if self.ann_index is None or size < self.ann_min_entries:
+            return
+        if (
+            self.ann_index.is_trained
+            and size < self.ann_index.trained_size * self.ann_retrain_factor
+        ):
+            return
+
+        # Retraining after the index has grown keeps the lists balanced
+        self.ann_index.train(self.matrix[:size])
+        if self.ann_index_path is not None:
+            self.ann_index.save(self.ann_index_path)
+
+    @log_execution_time
+    def search(self, query_embedding: np.ndarray) -> Tuple[str, float] | None:
+        if not self.arguments:
+            return None
+
+        query = self._normalize(query_embedding)
+        self._maybe_train_ann()
+        if self.ann_index is not None and self.ann_index.is_trained:
+            candidates = self.ann_index.candidates(query, len(self.arguments))
+            if candidates.size == 0:
+                return None
+            scores = self.matrix[candidates] @ query
+            best = int(np.argmax(scores))
+            return self.arguments[int(candidates[best])], float(scores[best])
+
+        scores = self.matrix[: len(self.arguments)] @ query
+        best = int(np.argmax(scores))
+        return self.arguments[best], float(scores[best])
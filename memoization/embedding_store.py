@@ -0,0 +1,160 @@
+import json
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from utils.logger import log_execution_time, logger
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store for argument embeddings.
+
+    Three files share the ``store_path`` prefix:
+      - ``.meta.json``: model name, embedding dimension and dtype
+      - ``.ids.jsonl``: one JSON-encoded argument per row
+      - ``.bin``: raw row-major embedding matrix, read back as a memory map
+    """
+
+    def __init__(self, store_path: str, model_name: str, dtype: str = "float32"):
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.meta_file = f"{store_path}.meta.json"
+        self.ids_file = f"{store_path}.ids.jsonl"
+        self.data_file = f"{store_path}.bin"
+        self.dimension: int | None = None
+        logger.info(f"EmbeddingStore initialized with path: {store_path}")
+
+    def _read_meta(self) -> dict | None:
+        try:
+            with open(self.meta_file, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, dimension: int) -> None:
+        os.makedirs(os.path.dirname(self.meta_file) or ".", exist_ok=True)
+        with open(self.meta_file, "w") as f:
+            json.dump(
+                {
+                    "model": self.model_name,
+                    "dimension": dimension,
+                    "dtype": self.dtype.name,
+                },
+                f,
+            )
+        self.dimension = dimension
+
+    def invalidate(self) -> None:
+        for path in (self.meta_file, self.ids_file, self.data_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.dimension = None
+        logger.info("Embedding store invalidated")
+
+    @log_execution_time
+    def load(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Returns the stored arguments and a read-only memory map of their embeddings.
+        The store is discarded if it was written with a different model or dtype.
+        """
+        meta = self._read_meta()
+        if meta is None:
+            return [], np.zeros((0, 0), dtype=self.dtype)
+
+        if meta.get("model") != self.model_name or meta.get("dtype") != self.dtype.name:
+            logger.warning(
+                f"Embedding store was built with model {meta.get('model')} "
+                f"({meta.get('dtype')}), expected {self.model_name} ({self.dtype.name})"
+            )
+            self.invalidate()
+            return [], np.zeros((0, 0), dtype=self.dtype)
+
+        self.dimension = meta["dimension"]
+        arguments: List[str] = []
+        if os.path.exists(self.ids_file):
+            with open(self.ids_file, "r") as f:
+                for line in f:
+                    try:
+                        arguments.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn trailing write; everything after it is unusable
+                        break
+
+        row_bytes = self.dimension * self.dtype.itemsize
+        data_bytes = (
+            os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0
+        )
+        rows = min(len(arguments), data_bytes // row_bytes)
+        self._truncate(arguments, data_bytes, rows)
+        if rows == 0:
+            return [], np.zeros((0, self.dimension), dtype=self.dtype)
+
+        embeddings = np.memmap(
+            self.data_file, dtype=self.dtype, mode="r", shape=(rows, self.dimension)
+        )
+        logger.info(f"Loaded {rows} embeddings from {self.data_file}")
+        return arguments[:rows], embeddings
+
+    def _truncate(self, arguments: List[str], data_bytes: int, rows: int) -> None:
+        # Drop a half-written trailing append so ids and rows stay aligned
+        row_bytes = self.dimension * self.dtype.itemsize
+        if data_bytes > rows * row_bytes:
+            with open(self.data_file, "r+b") as f:
+                f.truncate(rows * row_bytes)
+        if len(arguments) > rows:
+            with open(self.ids_file, "w") as f:
+                for argument in arguments[:rows]:
+                    f.write(json.dumps(argument) + "\n")
+        if data_bytes != rows * row_bytes or len(arguments) != rows:
+            logger.warning(f"Repaired embedding store to {rows} consistent rows")
+
+    @log_execution_time
+    def rewrite(self, arguments: List[str], embeddings: np.ndarray) -> None:
+        """
+        Replaces the store contents, dropping rows for evicted arguments.
+        """
+        embeddings = np.asarray(embeddings, dtype=self.dtype)
+        if not arguments:
+            self.invalidate()
+            return
+
+        self._write_meta(embeddings.shape[1])
+        with open(f"{self.data_file}.tmp", "wb") as f:
+            f.write(embeddings.tobytes())
+        with open(f"{self.ids_file}.tmp", "w") as f:
+            for argument in arguments:
+                f.write(json.dumps(argument) + "\n")
+        # Without an id map the store loads as empty, so a crash between the
+        # two renames costs a re-encode rather than misaligned rows
+        if os.path.exists(self.ids_file):
+            os.remove(self.ids_file)
+        os.replace(f"{self.data_file}.tmp", self.data_file)
+        os.replace(f"{self.ids_file}.tmp", self.ids_file)
+        logger.info(f"Embedding store rewritten with {len(arguments)} rows")
+
+    def append(self, argument: str, embedding: np.ndarray) -> None:
+        self.append_many([argument], np.asarray(embedding).reshape(1, -1))
+
+    def append_many(self, arguments: List[str], embeddings: np.ndarray) -> None:
+        if not arguments:
+            return
+
+        rows = np.asarray(embeddings, dtype=self.dtype).reshape(len(arguments), -1)
+        if self.dimension is None:
+            meta = self._read_meta()
+            if meta is None:
+                self._write_meta(rows.shape[1])
+            else:
+                self.dimension = meta["dimension"]
+        if rows.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {rows.shape[1]} does not match store dimension {self.dimension}"
+            )
+
+        with open(self.data_file, "ab") as f:
+            f.write(rows.tobytes())
+        with open(self.ids_file, "a") as f:
+            f.writelines(json.dumps(argument) + "\n" for argument in arguments)
+        logger.debug(f"Persisted {len(arguments)} embeddings")
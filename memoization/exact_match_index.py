@@ -0,0 +1,49 @@
+import hashlib
+import re
+import unicodedata
+from typing import Dict
+
+from utils.logger import logger
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_argument(argument: str) -> str:
+    """
+    Case-folds the argument, drops punctuation and collapses whitespace so that
+    trivially different resubmissions normalize to the same text.
+    """
+    text = unicodedata.normalize("NFKC", argument).casefold()
+    text = "".join(
+        " " if unicodedata.category(char).startswith("P") else char for char in text
+    )
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class ExactMatchIndex:
+    """
+    Maps a hash of each normalized cached argument to the argument as stored,
+    answering exact and trivially-equivalent repeats without any embeddings.
+    """
+
+    def __init__(self):
+        self.arguments: Dict[str, str] = {}
+        logger.info("ExactMatchIndex initialized")
+
+    def __len__(self) -> int:
+        return len(self.arguments)
+
+    @staticmethod
+    def _key(argument: str) -> str:
+        return hashlib.sha256(normalize_argument(argument).encode("utf-8")).hexdigest()
+
+    def add(self, argument: str) -> None:
+        self.arguments[self._key(argument)] = argument
+
+    def remove(self, argument: str) -> None:
+        key = self._key(argument)
+        if self.arguments.get(key) == argument:
+            del self.arguments[key]
+
+    def lookup(self, argument: str) -> str | None:
+        return self.arguments.get(self._key(argument))
@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+
+from utils.logger import log_execution_time, logger
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over the rows of an
+    EmbeddingIndex matrix. Rows are clustered with spherical k-means and a
+    query only scores the rows assigned to its ``num_probes`` closest
+    centroids. ``num_probes`` trades recall for latency; probing every list
+    is equivalent to a brute-force scan.
+    """
+
+    ASSIGN_CHUNK_SIZE = 8192
+
+    def __init__(
+        self,
+        num_lists: int | None = None,
+        num_probes: int = 8,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+    ):
+        self.num_lists = num_lists
+        self.num_probes = num_probes
+        self.kmeans_iterations = kmeans_iterations
+        self.rng = np.random.default_rng(seed)
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        logger.info(f"IVFIndex initialized with {num_probes} probes")
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.ASSIGN_CHUNK_SIZE):
+            chunk = vectors[start : start + self.ASSIGN_CHUNK_SIZE]
+            labels[start : start + len(chunk)] = np.argmax(
+                chunk @ self.centroids.T, axis=1
+            )
+        return labels
+
+    @log_execution_time
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Clusters ``vectors`` (normalized rows) and assigns every row to a list.
+        """
+        num_lists = self.num_lists or max(1, int(np.sqrt(len(vectors))))
+        num_lists = min(num_lists, len(vectors))
+
+        # k-means on a bounded sample; assignments below still cover every row
+        sample_size = min(len(vectors), num_lists * 256)
+        sample = vectors[self.rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[self.rng.choice(sample_size, num_lists, replace=False)]
+
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=num_lists)
+
+            empty = counts == 0
+            if empty.any():
+                # Reseed empty lists so every centroid keeps covering some rows
+                sums[empty] = sample[self.rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = self._assign(vectors)
+        self.trained_size = len(vectors)
+        logger.info(f"IVFIndex trained {num_lists} lists over {len(vectors)} rows")
+
+    def assign_all(self, vectors: np.ndarray) -> None:
+        self.assignments = self._assign(vectors)
+
+    def add(self, position: int, vector: np.ndarray) -> None:
+        if position >= len(self.assignments):
+            grown = np.zeros(max(position + 1, len(self.assignments) * 2), np.int32)
+            grown[: len(self.assignments)] = self.assignments
+            self.assignments = grown
+        self.assignments[position] = int(np.argmax(self.centroids @ vector))
+
+    def move(self, source: int, destination: int) -> None:
+        self.assignments[destination] = self.assignments[source]
+
+    def candidates(self, query: np.ndarray, size: int) -> np.ndarray:
+        num_probes = min(self.num_probes, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), num_probes - 1)[
+            :num_probes
+        ]
+        return np.flatnonzero(np.isin(self.assignments[:size], probes))
+
+    def save(self, path: str) -> None:
+        if not self.is_trained:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, centroids=self.centroids, trained_size=self.trained_size)
+        os.replace(temp_path, path)
+        logger.info(f"IVFIndex saved to {path}")
+
+    def load(self, path: str, dimension: int) -> bool:
+        """
+        Loads trained centroids; row assignments are recomputed by the caller.
+        """
+        if not os.path.exists(path):
+            return False
+
+        with np.load(path) as data:
+            centroids = data["centroids"]
+            trained_size = int(data["trained_size"])
+        if centroids.shape[1] != dimension:
+            logger.warning(
+                f"Ignoring IVFIndex at {path} built for dimension {centroids.shape[1]}"
+            )
+            return False
+
+        self.centroids = centroids.astype(np.float32)
+        self.trained_size = trained_size
+        logger.info(f"IVFIndex loaded from {path}")
+        return True
@@ -1,21 +1,82 @@
-from sentence_transformers import SentenceTransformer, util
+import threading
+from typing import List
 
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from config import memoization_config
 from utils.logger import log_execution_time, logger
 
 
 class SemanticSimilarity:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name="all-MiniLM-L6-v2",
+        batch_size: int = memoization_config.EMBEDDING_BATCH_SIZE,
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model: SentenceTransformer | None = None
+        # Encodes run in worker threads, so the first two may race to load
+        self._model_lock = threading.Lock()
         logger.info(f"SemanticSimilarity initialized with model: {model_name}")
 
+    @property
+    def model(self) -> SentenceTransformer:
+        # Loaded on first use so exact cache hits never pay for the model
+        with self._model_lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+                logger.info(f"Loaded SentenceTransformer model: {self.model_name}")
+        return self._model
+
+    @log_execution_time
+    def encode(self, argument: str) -> np.ndarray:
+        logger.debug(f"Encoding argument: '{argument[:50]}...'")
+        embedding = self.model.encode(
+            argument, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return embedding.astype(np.float32)
+
+    @log_execution_time
+    def encode_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Encodes texts in batches of ``batch_size``, running each distinct string
+        through the model once. Returns one normalized row per input text.
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        if not unique_texts:
+            dimension = self.model.get_sentence_embedding_dimension()
+            return np.zeros((0, dimension), dtype=np.float32)
+
+        logger.debug(
+            f"Encoding {len(unique_texts)} distinct texts out of {len(texts)} in batches of {self.batch_size}"
+        )
+        embeddings = self.model.encode(
+            unique_texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32)
+
+        if len(unique_texts) == len(texts):
+            return embeddings
+        positions = {text: i for i, text in enumerate(unique_texts)}
+        return embeddings[[positions[text] for text in texts]]
+
+    @log_execution_time
+    def similarity_matrix(self, queries: List[str], corpus: List[str]) -> np.ndarray:
+        """
+        Returns the (len(queries), len(corpus)) matrix of cosine similarities.
+        """
+        embeddings = self.encode_many(list(queries) + list(corpus))
+        return embeddings[: len(queries)] @ embeddings[len(queries) :].T
+
     @log_execution_time
     async def calculate_similarity(self, argument1: str, argument2: str) -> float:
         logger.debug(
             f"Calculating similarity between arguments: '{argument1[:50]}...' and '{argument2[:50]}...'"
         )
-        embedding1 = self.model.encode(argument1, convert_to_tensor=True)
-        embedding2 = self.model.encode(argument2, convert_to_tensor=True)
-
-        similarity = util.pytorch_cos_sim(embedding1, embedding2).item()
+        similarity = float(self.similarity_matrix([argument1], [argument2])[0, 0])
         logger.debug(f"Similarity calculated: {similarity}")
         return similarity
@@ -1,15 +1,27 @@
 import random
 from typing import Dict, List
 
+from config import api_config, debate_tree_config
 from config.environment import environment_config
 from evaluation.api_clients.base_api_client import BaseAPIClient
 from utils.async_utils import run_async_tasks
+from utils.json_utils import parse_json_reply
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import usage_meter
+
+GENERATION_MODES = ("json_list", "n", "per_argument")
 
 
 class ArgumentGenerationService:
-    def __init__(self, api_client: BaseAPIClient):
+    def __init__(
+        self,
+        api_client: BaseAPIClient,
+        generation_mode: str = debate_tree_config.ARGUMENT_GENERATION_MODE,
+    ):
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown argument generation mode: {generation_mode}")
         self.api_client = api_client
+        self.generation_mode = generation_mode
         logger.info("ArgumentGenerationService initialized")
 
     @log_execution_time
@@ -19,39 +31,22 @@ class ArgumentGenerationService:
         subcategory: str,
         support: str,
         against: str,
-        num_arguments_per_side: int = 3,
+        num_arguments_per_side: int = debate_tree_config.ARGUMENTS_PER_SIDE,
     ) -> Dict[str, List[str]]:
         logger.info(
             f"Generating {num_arguments_per_side * 2} arguments for {topic} - {subcategory}"
         )
 
-        async def generate_single_argument(prompt: str, stance: str) -> str:
-            system_message = (
-                f"You are an AI assistant tasked with generating a balanced and "
-                f"well-reasoned argument {stance} the topic. Provide a concise argument "
-                f"based on the given prompt, considering the {stance} perspective."
-                f"The argument should be a single argument and to the point."
-            )
-            response = await self.api_client.generate_text(
-                system_message=system_message, user_message=prompt
-            )
-            return response.strip()
-
-        # Generate arguments asynchronously
-        tasks_supporting = [
-            generate_single_argument(support, "supporting")
-            for _ in range(num_arguments_per_side)
-        ]
-        tasks_against = [
-            generate_single_argument(against, "against")
-            for _ in range(num_arguments_per_side)
-        ]
-
-        arguments_supporting = await run_async_tasks(tasks_supporting)
-        arguments_against = await run_async_tasks(tasks_against)
+        # Both sides are generated concurrently
+        arguments_supporting, arguments_against = await run_async_tasks(
+            [
+                self._generate_side(support, "supporting", num_arguments_per_side),
+                self._generate_side(against, "against", num_arguments_per_side),
+            ]
+        )
 
         for i, argument in enumerate(arguments_supporting + arguments_against):
-            stance = "supporting" if i < num_arguments_per_side else "against"
+            stance = "supporting" if i < len(arguments_supporting) else "against"
             logger.debug(
                 f"Generated {stance} argument {i % num_arguments_per_side + 1}: {argument}"
             )
@@ -60,3 +55,126 @@ class ArgumentGenerationService:
             f"Generated {len(arguments_supporting)} supporting arguments and {len(arguments_against)} arguments against"
         )
         return arguments_supporting + arguments_against
+
+    @staticmethod
+    def _system_message(stance: str) -> str:
+        return (
+            f"You are an AI assistant tasked with generating a balanced and "
+            f"well-reasoned argument {stance} the topic. Provide a concise argument "
+            f"based on the given prompt, considering the {stance} perspective."
+            f"The argument should be a single argument and to the point."
+        )
+
+    async def _generate_side(self, prompt: str, stance: str, count: int) -> List[str]:
+        """
+        Generates ``count`` distinct arguments for one side, batched according
+        to the generation mode, and tops up with one request per argument for
+        any the batched reply did not provide. Top-ups that repeat an argument
+        are dropped, so fewer than ``count`` may be returned.
+        """
+        if count <= 0:
+            return []
+
+        arguments: List[str] = []
+        batch_size = self._batch_size(prompt, stance, count)
+        try:
+            if batch_size > 1 and self.generation_mode == "json_list":
+                arguments = await self._generate_json_list(prompt, stance, batch_size)
+            elif batch_size > 1 and self.generation_mode == "n":
+                arguments = await self._generate_choices(prompt, stance, batch_size)
+        except ValueError as e:
+            logger.warning(
+                f"Batched generation of {stance} arguments failed, generating them one by one: {str(e)}"
+            )
+
+        arguments = self._distinct(arguments)[:count]
+        if len(arguments) < count:
+            if batch_size > 1:
+                logger.warning(
+                    f"Batched generation returned {len(arguments)} of {count} {stance} arguments"
+                )
+            arguments += await run_async_tasks(
+                [
+                    self._generate_single(prompt, stance)
+                    for _ in range(len(arguments), count)
+                ]
+            )
+            # A top-up can repeat a batched argument or another top-up
+            arguments = self._distinct(arguments)
+            if len(arguments) < count:
+                logger.warning(
+                    f"Dropped {count - len(arguments)} repeated {stance} arguments"
+                )
+        return arguments
+
+    def _batch_size(self, prompt: str, stance: str, count: int) -> int:
+        """
+        Returns how many arguments one batched request can ask for without
+        the token budget clamping its max_tokens, which would cut the reply
+        short and waste it.
+        """
+        remaining = usage_meter.remaining_tokens()
+        if remaining is None:
+            return count
+        prompt_tokens = (
+            len(self._system_message(stance)) + len(prompt)
+        ) // api_config.CHARS_PER_TOKEN
+        affordable = (remaining - prompt_tokens) // environment_config.MAX_TOKENS
+        if affordable < count:
+            logger.warning(
+                f"Token budget allows batching {max(affordable, 0)} of {count} {stance} arguments"
+            )
+        return max(0, min(count, affordable))
+
+    async def _generate_json_list(
+        self, prompt: str, stance: str, count: int
+    ) -> List[str]:
+        system_message = (
+            f"{self._system_message(stance)} "
+            f"Respond with only a JSON array of {count} strings, each a distinct "
+            f"argument taking a different angle, and nothing else."
+        )
+        content = await self.api_client.generate_text(
+            system_message, prompt, environment_config.MAX_TOKENS * count
+        )
+        return self._parse_argument_list(content)
+
+    async def _generate_choices(
+        self, prompt: str, stance: str, count: int
+    ) -> List[str]:
+        if not hasattr(self.api_client, "generate_texts"):
+            raise ValueError(
+                f"{type(self.api_client).__name__} cannot return several choices"
+            )
+        contents = await self.api_client.generate_texts(
+            self._system_message(stance), prompt, count
+        )
+        return [content.strip() for content in contents]
+
+    async def _generate_single(self, prompt: str, stance: str) -> str:
+        response = await self.api_client.generate_text(
+            self._system_message(stance), prompt
+        )
+        return response.strip()
+
+    @staticmethod
+    def _parse_argument_list(content: str) -> List[str]:
+        arguments = parse_json_reply(content)
+        if not isinstance(arguments, list):
+            raise ValueError("Expected a JSON array of arguments")
+        return [
+            argument.strip()
+            for argument in arguments
+            if isinstance(argument, str) and argument.strip()
+        ]
+
+    @staticmethod
+    def _distinct(arguments: List[str]) -> List[str]:
+        seen = set()
+        distinct = []
+        for argument in arguments:
+            key = " ".join(argument.casefold().split())
+            if argument and key not in seen:
+                seen.add(key)
+                distinct.append(argument)
+        return distinct
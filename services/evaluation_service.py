@@ -1,35 +1,312 @@
+import asyncio
+from contextlib import nullcontext
+from numbers import Number
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
 from config import evaluation_config
+from evaluation.api_clients.response_cache import bypass_response_cache
 from evaluation.model_factory import ModelFactory
+from services.memoization_service import MemoizationService
+from utils.async_utils import run_async_tasks
 from utils.logger import log_execution_time, logger
+from utils.usage_meter import TokenBudgetExceededError
+
+
+class NoModelAvailableError(RuntimeError):
+    """
+    Raised when every model failed or was skipped by its circuit breaker, so
+    an argument could not be scored at all.
+    """
 
 
 class EvaluationService:
-    def __init__(self, model_factory: ModelFactory):
+    def __init__(
+        self,
+        model_factory: ModelFactory,
+        memoization_service: MemoizationService | None = None,
+        max_concurrent_calls: int = evaluation_config.MAX_CONCURRENT_CALLS,
+        evaluation_modes: Dict[str, str] = evaluation_config.EVALUATION_MODES,
+    ):
         self.model_factory = model_factory
+        self.memoization_service = memoization_service
+        self.evaluation_modes = evaluation_modes
+        # Bounds model calls in flight across all arguments being evaluated
+        self.call_semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self.cache_stats: Dict[str, int] = {
+            "hits": 0,
+            "partial_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "cached_scores": 0,
+            "evaluated_scores": 0,
+            "unavailable_models": 0,
+        }
         logger.info("EvaluationService initialized")
 
+    def get_cache_stats(self, since: Dict[str, int] | None = None) -> Dict[str, int]:
+        """
+        Returns cache hit/miss counters, relative to an earlier snapshot if given.
+        """
+        since = since or {}
+        return {key: count - since.get(key, 0) for key, count in self.cache_stats.items()}
+
+    def _is_single_call(self, model_name: str) -> bool:
+        return self.evaluation_modes.get(model_name, "per_criterion") == "single_call"
+
+    def _score_keys(self, model_name: str, model: Any, criterion: str) -> List[str]:
+        # Cached per argument x model x criterion x prompt, so a new model,
+        # criterion or prompt edit only invalidates the scores it affects.
+        # Single-call models may also hold scores from their per-criterion
+        # fallback, keyed by the per-criterion prompt that produced them.
+        keys = [self._score_key(model_name, model, criterion, False)]
+        if self._is_single_call(model_name):
+            keys.insert(0, self._score_key(model_name, model, criterion, True))
+        return keys
+
+    @staticmethod
+    def _score_key(
+        model_name: str, model: Any, criterion: str, single_call: bool
+    ) -> str:
+        fingerprint = model.prompt_fingerprint(criterion, single_call)
+        return f"{model_name}/{criterion}/{fingerprint}"
+
     @log_execution_time
-    async def evaluate_argument(self, argument: str):
+    async def evaluate_argument(self, argument: str, use_cache: bool = True):
         logger.info(f"Evaluating argument: {argument[:50]}...")
+        # Opting out of caching also skips the API client's response cache
+        response_cache = nullcontext() if use_cache else bypass_response_cache()
+        use_cache = use_cache and self.memoization_service is not None
+
+        cached_scores: Dict[str, float] = {}
+        approximate = False
+        if use_cache:
+            match = await self.memoization_service.find_cached_evaluation(argument)
+            cached_entry, approximate = match
+            # Entries from older cache formats hold nested dicts and are ignored
+            cached_scores = {
+                key: score
+                for key, score in (cached_entry or {}).items()
+                if isinstance(score, Number)
+            }
+
         models = self.model_factory.get_models()
-        evaluations = {}
+        evaluations = {
+            model_name: dict.fromkeys(evaluation_config.CRITERIA)
+            for model_name in models
+        }
+        new_scores: Dict[str, float] = {}
+        missing_criteria: Dict[str, List[str]] = {}
+        cached_count = 0
+        tasks = []
 
         for model_name, model in models.items():
-            logger.debug(f"Evaluating with model: {model_name}")
-            coherence = await model.evaluate_coherence(argument)
-            persuasion = await model.evaluate_persuasion(argument)
-            cultural_acceptance = await model.evaluate_cultural_acceptance(argument)
-            factual_accuracy = await model.evaluate_factual_accuracy(argument)
-
-            evaluations[model_name] = {
-                evaluation_config.COHERENCE: coherence,
-                evaluation_config.PERSUASION: persuasion,
-                evaluation_config.CULTURAL_ACCEPTANCE: cultural_acceptance,
-                evaluation_config.FACTUAL_ACCURACY: factual_accuracy,
-            }
+            missing_criteria[model_name] = []
+            for criterion in evaluation_config.CRITERIA:
+                key = next(
+                    (
+                        key
+                        for key in self._score_keys(model_name, model, criterion)
+                        if key in cached_scores
+                    ),
+                    None,
+                )
+                if key is not None:
+                    evaluations[model_name][criterion] = cached_scores[key]
+                    cached_count += 1
+                else:
+                    missing_criteria[model_name].append(criterion)
+
+            missing = missing_criteria[model_name]
+            if not missing:
+                continue
+            breaker = self.model_factory.get_circuit_breaker(model_name)
+            if breaker.allow_request():
+                tasks.append(
+                    (model_name, self._evaluate_model(model_name, model, missing, argument))
+                )
+            else:
+                logger.warning(f"Skipping {model_name}: circuit is {breaker.state}")
+                evaluations[model_name] = None
+
+        # Every missing score is requested concurrently
+        with response_cache:
+            results = await run_async_tasks([task for _, task in tasks])
+        for (model_name, _), result in zip(tasks, results):
+            if result is None:
+                evaluations[model_name] = None
+                continue
+            scores, single_call = result
+            for criterion in missing_criteria[model_name]:
+                key = self._score_key(
+                    model_name, models[model_name], criterion, single_call
+                )
+                evaluations[model_name][criterion] = scores[criterion]
+                new_scores[key] = scores[criterion]
+
+        unavailable = [name for name, scores in evaluations.items() if scores is None]
+        if unavailable and len(unavailable) == len(evaluations):
+            self._record_cache_stats(use_cache, cached_count, new_scores, unavailable)
+            raise NoModelAvailableError(
+                f"No evaluation model is available; unavailable: {', '.join(unavailable)}"
+            )
+
+        for model_name in models:
             logger.debug(
                 f"Evaluation results for {model_name}: {evaluations[model_name]}"
             )
 
+        self._record_cache_stats(use_cache, cached_count, new_scores, unavailable)
+        if use_cache and new_scores:
+            # Scores of a similar argument are only borrowed, never stored as
+            # this argument's own. Scores from superseded prompts are dropped
+            # for the re-evaluated criteria.
+            refreshed = {key.rsplit("/", 1)[0] for key in new_scores}
+            retained_scores = {
+                key: score
+                for key, score in cached_scores.items()
+                if key.rsplit("/", 1)[0] not in refreshed and not approximate
+            }
+            await self.memoization_service.cache_evaluation(
+                argument, {**retained_scores, **new_scores}
+            )
+
         logger.info("Argument evaluation completed")
         return evaluations
+
+    @log_execution_time
+    async def evaluate_many(
+        self,
+        arguments: List[str],
+        use_cache: bool = True,
+        max_concurrency: int = evaluation_config.MAX_CONCURRENT_ARGUMENTS,
+    ) -> List[Dict[str, Dict[str, float]]]:
+        """
+        Evaluates arguments concurrently and returns their evaluations in order,
+        with None for arguments no model could score.
+        """
+        results: List[Dict[str, Dict[str, float]]] = [None] * len(arguments)
+        async for index, evaluation in self.evaluate_many_as_completed(
+            arguments, use_cache, max_concurrency
+        ):
+            results[index] = evaluation
+        return results
+
+    async def evaluate_many_as_completed(
+        self,
+        arguments: List[str],
+        use_cache: bool = True,
+        max_concurrency: int = evaluation_config.MAX_CONCURRENT_ARGUMENTS,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Dict[str, float]]]]:
+        """
+        Yields (index, evaluation) pairs as soon as each argument is evaluated.
+        At most ``max_concurrency`` arguments are in progress at once, and their
+        model calls still share the service-wide call semaphore. Arguments no
+        model could score yield None instead of failing the whole batch.
+        Repeated arguments are evaluated once and yielded at every index.
+        """
+        positions: Dict[str, List[int]] = {}
+        for index, argument in enumerate(arguments):
+            positions.setdefault(argument, []).append(index)
+        logger.info(
+            f"Evaluating {len(positions)} distinct of {len(arguments)} arguments "
+            f"with concurrency {max_concurrency}"
+        )
+        argument_semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def evaluate(argument: str):
+            async with argument_semaphore:
+                try:
+                    return argument, await self.evaluate_argument(argument, use_cache)
+                except NoModelAvailableError as e:
+                    logger.warning(
+                        f"Argument {positions[argument][0] + 1} left unscored: {str(e)}"
+                    )
+                    return argument, None
+
+        tasks = [asyncio.create_task(evaluate(argument)) for argument in positions]
+        try:
+            for task in asyncio.as_completed(tasks):
+                argument, evaluation = await task
+                for index in positions[argument]:
+                    yield index, evaluation
+        finally:
+            # Stop outstanding work if the caller fails or stops consuming early
+            for task in tasks:
+                task.cancel()
+
+    async def _evaluate_model(
+        self, model_name: str, model: Any, missing: List[str], argument: str
+    ) -> Tuple[Dict[str, float], bool] | None:
+        """
+        Requests a model's missing scores and returns them with whether the
+        single-call prompt produced them. Returns None if the model failed, so
+        the argument can still be scored by the remaining models. The model's
+        API client reports each request's outcome to its circuit breaker.
+        """
+        breaker = self.model_factory.get_circuit_breaker(model_name)
+        try:
+            if self._is_single_call(model_name):
+                return await self._evaluate_all(model, argument)
+            return await self._evaluate_criteria(model, missing, argument), False
+        except (asyncio.CancelledError, TokenBudgetExceededError):
+            raise
+        except Exception as e:
+            logger.error(f"Evaluation with {model_name} failed: {str(e)}")
+            return None
+        finally:
+            breaker.release()
+
+    async def _evaluate_criterion(
+        self, model: Any, criterion: str, argument: str
+    ) -> Dict[str, float]:
+        async with self.call_semaphore:
+            return {criterion: await getattr(model, f"evaluate_{criterion}")(argument)}
+
+    async def _evaluate_criteria(
+        self, model: Any, criteria: List[str], argument: str
+    ) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for result in await run_async_tasks(
+            [
+                self._evaluate_criterion(model, criterion, argument)
+                for criterion in criteria
+            ]
+        ):
+            scores.update(result)
+        return scores
+
+    async def _evaluate_all(
+        self, model: Any, argument: str
+    ) -> Tuple[Dict[str, float], bool]:
+        async with self.call_semaphore:
+            try:
+                return await model.evaluate_all(argument, fallback=False), True
+            except ValueError as e:
+                logger.warning(
+                    f"Falling back to per-criterion evaluation for {type(model).__name__}: {str(e)}"
+                )
+
+        # The slot is released first so each fallback call takes its own
+        return (
+            await self._evaluate_criteria(model, evaluation_config.CRITERIA, argument),
+            False,
+        )
+
+    def _record_cache_stats(
+        self,
+        use_cache: bool,
+        cached_count: int,
+        new_scores: Dict[str, float],
+        unavailable: List[str],
+    ) -> None:
+        self.cache_stats["evaluated_scores"] += len(new_scores)
+        self.cache_stats["cached_scores"] += cached_count
+        self.cache_stats["unavailable_models"] += len(unavailable)
+        if not use_cache:
+            self.cache_stats["bypassed"] += 1
+        elif not new_scores and not unavailable:
+            self.cache_stats["hits"] += 1
+        elif cached_count:
+            self.cache_stats["partial_hits"] += 1
+        else:
+            self.cache_stats["misses"] += 1
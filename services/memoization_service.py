@@ -1,7 +1,12 @@
-from typing import Any, Dict
+import asyncio
+import time
+from typing import Any, Dict, Tuple
 
 from config import memoization_config
 from memoization.cache_manager import CacheManager
+from memoization.embedding_index import EmbeddingIndex
+from memoization.embedding_store import EmbeddingStore
+from memoization.exact_match_index import ExactMatchIndex
 from memoization.semantic_similarity import SemanticSimilarity
 from utils.logger import log_execution_time, logger
 
@@ -12,32 +17,181 @@ class MemoizationService:
         semantic_similarity: SemanticSimilarity,
         cache_manager: CacheManager,
         similarity_threshold: float = memoization_config.SIMILARITY_THRESHOLD,
+        embedding_index: EmbeddingIndex | None = None,
+        embedding_store: EmbeddingStore | None = None,
+        exact_match_index: ExactMatchIndex | None = None,
     ):
         self.semantic_similarity = semantic_similarity
         self.cache_manager = cache_manager
         self.similarity_threshold = similarity_threshold
+        self.embedding_index = (
+            embedding_index if embedding_index is not None else EmbeddingIndex()
+        )
+        self.embedding_store = embedding_store
+        self.exact_match_index = (
+            exact_match_index if exact_match_index is not None else ExactMatchIndex()
+        )
+        self._index_built = False
+        self._exact_index_built = False
+        self._stale_store_rows = 0
+        self._synced_at = 0.0
+        # Held while encodes run off the event loop, so index builds and
+        # additions from concurrent lookups do not interleave
+        self._index_lock = asyncio.Lock()
+        self.cache_manager.add_eviction_listener(self._on_evicted)
         logger.info(
             f"MemoizationService initialized with similarity threshold: {self.similarity_threshold}"
         )
 
     @log_execution_time
+    def _ensure_exact_index(self) -> None:
+        if self._exact_index_built:
+            return
+
+        self._synced_at = time.time()
+        for cached_arg in self.cache_manager.get_all_arguments():
+            self.exact_match_index.add(cached_arg)
+        self._exact_index_built = True
+        logger.info(
+            f"Exact match index built with {len(self.exact_match_index)} entries"
+        )
+
+    @log_execution_time
+    async def _ensure_index(self) -> None:
+        # The index is built on first lookup so startup does not pay for encoding
+        if self._index_built:
+            return
+
+        async with self._index_lock:
+            if not self._index_built:
+                await self._build_index()
+
+    async def _build_index(self) -> None:
+        cached_arguments = set(self.cache_manager.get_all_arguments())
+        if self.embedding_store is not None:
+            stored_arguments, embeddings = self.embedding_store.load()
+            for argument, embedding in zip(stored_arguments, embeddings):
+                if argument in cached_arguments:
+                    self.embedding_index.add(argument, embedding)
+                else:
+                    self._stale_store_rows += 1
+
+        missing = [arg for arg in cached_arguments if arg not in self.embedding_index]
+        if missing:
+            # Encoding a cold cache can take minutes; the loop keeps serving I/O
+            embeddings = await asyncio.to_thread(
+                self.semantic_similarity.encode_many, missing
+            )
+            for argument, embedding in zip(missing, embeddings):
+                self.embedding_index.add(argument, embedding)
+            if self.embedding_store is not None:
+                self.embedding_store.append_many(missing, embeddings)
+        self.embedding_index.load_ann()
+        self._index_built = True
+        self._compact_store_if_needed()
+        logger.info(f"Embedding index built with {len(self.embedding_index)} entries")
+
+    async def _index_argument(self, argument: str) -> None:
+        # Re-stored arguments keep their embedding; appending it again would
+        # leave a duplicate row in the store that compaction never counts.
+        # Callers hold the index lock, so the check still holds after encoding
+        if argument in self.embedding_index:
+            return
+        embedding = await asyncio.to_thread(self.semantic_similarity.encode, argument)
+        self.embedding_index.add(argument, embedding)
+        if self.embedding_store is not None:
+            self.embedding_store.append(argument, embedding)
+
+    async def _sync_shared_entries(self) -> None:
+        # Processes sharing the backend store entries after the indexes are
+        # built; those are picked up by store time on each lookup
+        stored = self.cache_manager.arguments_stored_since(
+            self._synced_at - memoization_config.INDEX_SYNC_OVERLAP_SECONDS
+        )
+        self._synced_at = time.time()
+        for argument in stored:
+            self.exact_match_index.add(argument)
+        if stored and (self._index_built or self._index_lock.locked()):
+            async with self._index_lock:
+                for argument in stored:
+                    await self._index_argument(argument)
+
+    def _on_evicted(self, argument: str) -> None:
+        self.exact_match_index.remove(argument)
+        if argument in self.embedding_index:
+            self.embedding_index.remove(argument)
+            self._stale_store_rows += 1
+            self._compact_store_if_needed()
+
+    def _compact_store_if_needed(self) -> None:
+        # Evicted rows stay in the append-only store until they outnumber live rows
+        if (
+            self.embedding_store is None
+            or self._stale_store_rows <= max(len(self.embedding_index), 1)
+        ):
+            return
+
+        self.embedding_store.rewrite(
+            list(self.embedding_index.arguments),
+            self.embedding_index.matrix[: len(self.embedding_index)],
+        )
+        self._stale_store_rows = 0
+
     async def get_cached_evaluation(self, argument: str) -> Dict[str, Any] | None:
+        evaluation, _ = await self.find_cached_evaluation(argument)
+        return evaluation
+
+    @log_execution_time
+    async def find_cached_evaluation(
+        self, argument: str
+    ) -> Tuple[Dict[str, Any] | None, bool]:
+        """
+        Returns the cached evaluation for ``argument`` and whether it belongs
+        to a semantically similar argument rather than an exact match. Callers
+        must not store approximate scores under ``argument``.
+        """
         logger.debug(f"Searching for cached evaluation: '{argument[:50]}...'")
-        cached_arguments = self.cache_manager.get_all_arguments()
+        evaluation = self.cache_manager.retrieve(argument)
+        if evaluation is not None:
+            logger.info("Cache hit: exact match")
+            return evaluation, False
 
-        for cached_arg, evaluation in cached_arguments.items():
-            similarity = await self.semantic_similarity.calculate_similarity(
-                argument, cached_arg
-            )
-            if similarity >= self.similarity_threshold:
+        self._ensure_exact_index()
+        await self._sync_shared_entries()
+        exact_match = self.exact_match_index.lookup(argument)
+        if exact_match is not None:
+            evaluation = self.cache_manager.retrieve(exact_match)
+            if evaluation is not None:
+                logger.info("Cache hit: exact match")
+                return evaluation, False
+            # Evicted by another process sharing the backend
+            self._on_evicted(exact_match)
+
+        await self._ensure_index()
+
+        query = await asyncio.to_thread(self.semantic_similarity.encode, argument)
+        while True:
+            match = self.embedding_index.search(query)
+            if match is None or match[1] < self.similarity_threshold:
+                break
+            cached_arg, similarity = match
+            evaluation = self.cache_manager.retrieve(cached_arg)
+            if evaluation is not None:
                 logger.info(f"Cache hit: similarity {similarity:.2f}")
-                return evaluation
+                return evaluation, True
+            self._on_evicted(cached_arg)
 
         logger.debug("Cache miss")
-        return None
+        return None, False
 
     @log_execution_time
     async def cache_evaluation(self, argument: str, evaluation: Dict[str, Any]) -> None:
         logger.debug(f"Caching evaluation for: '{argument[:50]}...'")
         self.cache_manager.store(argument, evaluation)
+        if self._exact_index_built:
+            self.exact_match_index.add(argument)
+        # A build in progress read the cache before this store, so wait for it
+        if self._index_built or self._index_lock.locked():
+            async with self._index_lock:
+                await self._index_argument(argument)
         logger.debug("Evaluation cached")
@@ -8,6 +8,9 @@ class ScoreAggregatorService:
         aggregated_scores = {}
         for result in evaluation_results:
             for model, scores in result.items():
+                # Models that were unavailable for this argument have no scores
+                if scores is None:
+                    continue
                 if model not in aggregated_scores:
                     aggregated_scores[model] = {k: [] for k in scores.keys()}
                 for criterion, score in scores.items():
@@ -33,14 +36,19 @@ class ScoreAggregatorService:
             "cultural_acceptance": 0.0,
             "factual_accuracy": 0.0,
         }
-        for scores in evaluation_results.values():
+        available_scores = [
+            scores for scores in evaluation_results.values() if scores is not None
+        ]
+        for scores in available_scores:
             for criterion, score in scores.items():
                 total_scores[criterion] += score
 
         for key in total_scores.keys():
-            total_scores[key] /= 2
+            total_scores[key] /= len(available_scores)
 
-        logger.debug(f"Average scores of both models: {total_scores}")
+        logger.debug(
+            f"Average scores of {len(available_scores)} models: {total_scores}"
+        )
 
         final_score = 0.0
         for score in total_scores.values():
@@ -1,6 +1,10 @@
 from config import memoization_config
 from evaluation.model_factory import ModelFactory
 from memoization.cache_manager import CacheManager
+from memoization.embedding_index import EmbeddingIndex
+from memoization.embedding_store import EmbeddingStore
+from memoization.exact_match_index import ExactMatchIndex
+from memoization.ivf_index import IVFIndex
 from memoization.semantic_similarity import SemanticSimilarity
 from services.argument_generation_service import ArgumentGenerationService
 from services.async_processing_service import AsyncProcessingService
@@ -23,16 +27,40 @@ class ServicesInjector:
 
         # Initialize memoization components
         semantic_similarity = SemanticSimilarity(
-            memoization_config.SEMANTIC_SIMILARITY_MODEL
+            memoization_config.SEMANTIC_SIMILARITY_MODEL,
+            memoization_config.EMBEDDING_BATCH_SIZE,
+        )
+        cache_manager = CacheManager(
+            memoization_config.CACHE_FILE_PATH, memoization_config.CACHE_BACKEND
+        )
+        exact_match_index = ExactMatchIndex()
+        ann_index = (
+            IVFIndex(memoization_config.ANN_NUM_LISTS, memoization_config.ANN_NUM_PROBES)
+            if memoization_config.ANN_ENABLED
+            else None
+        )
+        embedding_index = EmbeddingIndex(
+            ann_index=ann_index,
+            ann_min_entries=memoization_config.ANN_MIN_ENTRIES,
+            ann_index_path=memoization_config.ANN_INDEX_PATH,
+        )
+        embedding_store = EmbeddingStore(
+            memoization_config.EMBEDDING_STORE_PATH,
+            memoization_config.SEMANTIC_SIMILARITY_MODEL,
+            memoization_config.EMBEDDING_STORE_DTYPE,
         )
-        cache_manager = CacheManager(memoization_config.CACHE_FILE_PATH)
         memoization_service = MemoizationService(
-            semantic_similarity, cache_manager, memoization_config.SIMILARITY_THRESHOLD
+            semantic_similarity,
+            cache_manager,
+            memoization_config.SIMILARITY_THRESHOLD,
+            embedding_index,
+            embedding_store,
+            exact_match_index,
         )
 
         # Initialize other services
         async_processing_service = AsyncProcessingService()
-        evaluation_service = EvaluationService(model_factory)
+        evaluation_service = EvaluationService(model_factory, memoization_service)
         model_selection_service = ModelSelectionService(model_factory)
         argument_generation_service = ArgumentGenerationService(
             model_factory.get_model("ChatGPT")
@@ -50,5 +78,8 @@ class ServicesInjector:
         registry.register("score_aggregator_service", score_aggregator_service)
         registry.register("semantic_similarity", semantic_similarity)
         registry.register("cache_manager", cache_manager)
+        registry.register("exact_match_index", exact_match_index)
+        registry.register("embedding_index", embedding_index)
+        registry.register("embedding_store", embedding_store)
 
         logger.info("Services injected successfully")
@@ -1,13 +1,19 @@
 from .async_utils import run_async_tasks, run_with_timeout
 from .dependency_registry import DependencyRegistry
+from .json_utils import parse_json_reply
 from .logger import logger
+from .metrics import metrics
+from .usage_meter import TokenBudgetExceededError, metered, usage_meter
 
 __all__ = [
+    "TokenBudgetExceededError",
     "DependencyRegistry",
     "logger",
+    "metered",
+    "metrics",
+    "parse_json_reply",
     "run_async_tasks",
     "run_with_timeout",
+    "usage_meter",
 ]
 
-
-# Not used: run_with_timeout
@@ -0,0 +1,14 @@
+import json
+from typing import Any
+
+
+def parse_json_reply(content: str) -> Any:
+    """
+    Parses a model reply that should be a single JSON value, tolerating a
+    fenced code block around it and nothing else. Raises ValueError when the
+    reply is not valid JSON.
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    return json.loads(text)
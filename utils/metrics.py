@@ -0,0 +1,32 @@
+from collections import defaultdict
+from typing import Dict
+
+from utils.logger import logger
+
+
+class Metrics:
+    """
+    Process-wide counters and gauges, e.g. ``ChatGPT.retries``.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.gauges: Dict[str, float] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self.counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {"counters": dict(self.counters), "gauges": dict(self.gauges)}
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.gauges.clear()
+        logger.debug("Metrics reset")
+
+
+# Global instance
+metrics = Metrics()
@@ -0,0 +1,250 @@
+import functools
+import json
+import os
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Tuple
+
+from config import api_config
+from utils.logger import logger
+
+REFUSE = "refuse"
+DEGRADE = "degrade"
+
+
+class TokenBudgetExceededError(Exception):
+    """
+    Raised when a request would take a token budget past its limit.
+    """
+
+
+class UsageScope:
+    """
+    Tokens used by one command invocation.
+    """
+
+    def __init__(self, command: str | None):
+        self.command = command
+        self.usage: Counter = Counter()
+        # Tokens reserved by requests still in flight
+        self.reserved = 0
+
+
+class Reservation:
+    """
+    Tokens set aside for one request until it completes.
+    """
+
+    def __init__(self, tokens: int, scope: UsageScope | None, debate: str | None):
+        self.tokens = tokens
+        self.scope = scope
+        self.debate = debate
+
+
+_command_scope: ContextVar[UsageScope | None] = ContextVar(
+    "usage_command_scope", default=None
+)
+_debate: ContextVar[str | None] = ContextVar("usage_debate", default=None)
+
+
+class UsageMeter:
+    """
+    Accumulates provider-reported token usage and its cost.
+
+    Every request is counted once towards its model and the session total,
+    and charged to the command and debate tree of each caller that receives
+    its response; both come from context variables, so every task spawned by
+    a command is attributed to it. Token budgets are
+    enforced per command invocation, per debate and for the whole session.
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, int | None] = api_config.TOKEN_BUDGETS,
+        budget_mode: str = api_config.TOKEN_BUDGET_MODE,
+        prices: Dict[str, Dict[str, float]] = api_config.TOKEN_PRICES,
+    ):
+        if budget_mode not in (REFUSE, DEGRADE):
+            raise ValueError(f"Unknown token budget mode: {budget_mode}")
+        self.budgets = budgets
+        self.budget_mode = budget_mode
+        self.prices = prices
+        self.models: Dict[str, Counter] = defaultdict(Counter)
+        self.commands: Dict[str, Counter] = defaultdict(Counter)
+        self.debates: Dict[str, Counter] = defaultdict(Counter)
+        self.total: Counter = Counter()
+        self.reserved_total = 0
+        self.reserved_debates: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def scope(self, command: str | None = None) -> Iterator[UsageScope]:
+        """
+        Attributes usage inside the block to ``command``. The debate set with
+        set_debate() inside the block is reset when it exits.
+        """
+        command_token = _command_scope.set(UsageScope(command))
+        debate_token = _debate.set(None)
+        try:
+            yield _command_scope.get()
+        finally:
+            _debate.reset(debate_token)
+            _command_scope.reset(command_token)
+
+    @staticmethod
+    def set_debate(debate: str | None) -> None:
+        _debate.set(debate)
+
+    def _cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        price = self.prices.get(model)
+        if price is None:
+            return 0.0
+        return (
+            prompt_tokens * price["prompt"] + completion_tokens * price["completion"]
+        ) / 1_000_000
+
+    @staticmethod
+    def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+        return {
+            "requests": 1,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """
+        Counts a completed request towards its model and the session total.
+        """
+        usage = self._usage(prompt_tokens, completion_tokens)
+        cost = self._cost(model, prompt_tokens, completion_tokens)
+        for counter in (self.total, self.models[model]):
+            counter.update(usage)
+            counter["cost_usd"] += cost
+
+    def attribute(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """
+        Charges a response's usage to the command and debate of the current
+        context. Every caller that receives the response is charged, including
+        those whose identical request was coalesced with another caller's.
+        """
+        usage = self._usage(prompt_tokens, completion_tokens)
+        cost = self._cost(model, prompt_tokens, completion_tokens)
+
+        scope = _command_scope.get()
+        debate = _debate.get()
+        counters = []
+        if scope is not None:
+            counters.append(scope.usage)
+            if scope.command is not None:
+                counters.append(self.commands[scope.command])
+        if debate is not None:
+            counters.append(self.debates[debate])
+        for counter in counters:
+            counter.update(usage)
+            counter["cost_usd"] += cost
+
+    def _remaining_tokens(self, scope: UsageScope | None, debate: str | None) -> int | None:
+        """
+        Returns the tokens left under the tightest budget that applies, counting
+        tokens reserved by requests in flight as spent, or None when no budget
+        applies.
+        """
+        used = {"total": self.total["total_tokens"] + self.reserved_total}
+        if scope is not None:
+            used["command"] = scope.usage["total_tokens"] + scope.reserved
+        if debate is not None:
+            used["debate"] = self.debates.get(debate, Counter())[
+                "total_tokens"
+            ] + self.reserved_debates.get(debate, 0)
+        remaining = [
+            budget - used[name]
+            for name, budget in self.budgets.items()
+            if budget is not None and name in used
+        ]
+        return min(remaining, default=None)
+
+    def remaining_tokens(self) -> int | None:
+        """
+        Returns the tokens left to the current command and debate under the
+        tightest budget, or None when no budget applies.
+        """
+        return self._remaining_tokens(_command_scope.get(), _debate.get())
+
+    def reserve(
+        self, prompt_tokens: int, max_tokens: int, choices: int = 1
+    ) -> Tuple[int, Reservation]:
+        """
+        Sets tokens aside for a request of ``choices`` completions of up to
+        ``max_tokens`` each and returns the max_tokens it may use. In "refuse"
+        mode a request that would exceed a budget raises; in "degrade" mode
+        each completion is clamped so all of them fit in what is left, and it
+        only raises when nothing is. The reservation must be released once
+        the request completes.
+        """
+        scope = _command_scope.get()
+        debate = _debate.get()
+        remaining = self._remaining_tokens(scope, debate)
+        needed = prompt_tokens + max_tokens * choices
+        if remaining is not None and needed > remaining:
+            allowed = (remaining - prompt_tokens) // choices
+            if self.budget_mode == REFUSE or allowed < 1:
+                raise TokenBudgetExceededError(
+                    f"Request needs about {needed} tokens but "
+                    f"only {max(remaining, 0)} remain in the token budget"
+                )
+            logger.warning(
+                f"Token budget nearly spent; clamping max_tokens to {allowed}"
+            )
+            max_tokens = allowed
+
+        reservation = Reservation(prompt_tokens + max_tokens * choices, scope, debate)
+        self._adjust_reserved(reservation, reservation.tokens)
+        return max_tokens, reservation
+
+    def release(self, reservation: Reservation) -> None:
+        self._adjust_reserved(reservation, -reservation.tokens)
+
+    def _adjust_reserved(self, reservation: Reservation, tokens: int) -> None:
+        self.reserved_total += tokens
+        if reservation.scope is not None:
+            reservation.scope.reserved += tokens
+        if reservation.debate is not None:
+            self.reserved_debates[reservation.debate] += tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        def rollup(counters: Dict[str, Counter]) -> Dict[str, Dict[str, float]]:
+            return {name: dict(counter) for name, counter in counters.items()}
+
+        return {
+            "total": dict(self.total),
+            "models": rollup(self.models),
+            "commands": rollup(self.commands),
+            "debates": rollup(self.debates),
+        }
+
+    def export(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        logger.info(f"Token usage report written to {path}")
+
+
+def metered(execute):
+    """
+    Decorates a command's execute() so its usage is attributed to the command.
+    """
+
+    @functools.wraps(execute)
+    async def wrapper(self, *args, **kwargs):
+        with usage_meter.scope(type(self).__name__) as scope:
+            try:
+                return await execute(self, *args, **kwargs)
+            finally:
+                logger.info(f"Token usage report: {dict(scope.usage)}")
+
+    return wrapper
+
+
+# Global instance
+usage_meter = UsageMeter()